@@ -4,10 +4,69 @@ from dotenv import load_dotenv
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+# Per worker process; keep workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) under MySQL's max_connections
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))  # seconds to wait for a free connection
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+# Reconnect before MySQL's wait_timeout or a proxy drops an idle connection; -1 = never
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() == "true"  # log every SQL statement
+# At startup: strict refuses to serve on an unmigrated database, warn only logs it, off skips the check
+SCHEMA_CHECK = os.getenv("SCHEMA_CHECK", "strict")  # strict | warn | off
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+# Authenticated principals are cached per process; 0 disables the cache
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+# Admin edits rebuild the curriculum snapshot in the worker that made them at
+# once; other worker processes pick them up within this many seconds
+CURRICULUM_SNAPSHOT_TTL_SECONDS = float(os.getenv("CURRICULUM_SNAPSHOT_TTL_SECONDS", "60"))
+# Sent with ETag on curriculum and shop catalogue responses. "no-cache" lets
+# clients keep bodies but revalidate each time, getting a 304 if unchanged
+CURRICULUM_CACHE_CONTROL = os.getenv("CURRICULUM_CACHE_CONTROL", "private, no-cache")
+# bcrypt cost factor; each +1 doubles hashing time. Measure with scripts/bench_bcrypt.py
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Threads that run bcrypt, off the event loop; roughly one per core to spare for logins
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Password checks queued or running before logins get a 503; 0 = unbounded
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
 
 CLOUDFLARE_R2_BUCKET = os.getenv("CLOUDFLARE_R2_BUCKET")
 CLOUDFLARE_R2_ACCESS_KEY = os.getenv("CLOUDFLARE_R2_ACCESS_KEY")
-CLOUDFLARE_R2_SECRET_KEY = os.getenv("CLOUDFLARE_R2_SECRET_KEY")
\ No newline at end of file
+CLOUDFLARE_R2_SECRET_KEY = os.getenv("CLOUDFLARE_R2_SECRET_KEY")
+
+RECOGNITION_BACKEND = os.getenv("RECOGNITION_BACKEND", "keras")  # keras | tflite | onnx
+RECOGNITION_MODEL_PATH = os.getenv(
+    "RECOGNITION_MODEL_PATH",
+    {"tflite": "models/model.tflite", "onnx": "models/model.onnx"}.get(RECOGNITION_BACKEND, "models/model.h5"),
+)
+RECOGNITION_THREADS = int(os.getenv("RECOGNITION_THREADS", "0"))  # 0 = runtime default
+RECOGNITION_MODEL_VERSION = os.getenv("RECOGNITION_MODEL_VERSION")
+RECOGNITION_WARMUP_RUNS = int(os.getenv("RECOGNITION_WARMUP_RUNS", "3"))
+INFERENCE_MAX_BATCH_SIZE = int(os.getenv("INFERENCE_MAX_BATCH_SIZE", "16"))
+INFERENCE_MAX_WAIT_MS = float(os.getenv("INFERENCE_MAX_WAIT_MS", "10"))
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "4"))
+INFERENCE_CONCURRENT_BATCHES = int(os.getenv("INFERENCE_CONCURRENT_BATCHES", "1"))
+# Most frames accepted by one /predict-batch request
+RECOGNITION_BATCH_MAX_FRAMES = int(os.getenv("RECOGNITION_BATCH_MAX_FRAMES", "64"))
+# 0 runs the model in-process; N > 0 starts N recognition worker processes
+RECOGNITION_POOL_WORKERS = int(os.getenv("RECOGNITION_POOL_WORKERS", "0"))
+RECOGNITION_POOL_PIN_CPUS = os.getenv("RECOGNITION_POOL_PIN_CPUS", "true").lower() == "true"
+# Longest a batch waits for an idle worker process before failing
+RECOGNITION_POOL_ACQUIRE_TIMEOUT_SECONDS = float(os.getenv("RECOGNITION_POOL_ACQUIRE_TIMEOUT_SECONDS", "30"))
+
+RECOGNITION_CACHE_SIZE = int(os.getenv("RECOGNITION_CACHE_SIZE", "10000"))
+RECOGNITION_CACHE_TTL_SECONDS = float(os.getenv("RECOGNITION_CACHE_TTL_SECONDS", "30"))
+RECOGNITION_CACHE_MAX_BYTES = int(os.getenv("RECOGNITION_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+RECOGNITION_CACHE_KEY = os.getenv("RECOGNITION_CACHE_KEY", "exact")  # exact | perceptual
+
+# Admission control for recognition requests; 0 disables a cap
+RECOGNITION_MAX_IN_FLIGHT = int(os.getenv("RECOGNITION_MAX_IN_FLIGHT", "64"))
+RECOGNITION_MAX_PER_USER = int(os.getenv("RECOGNITION_MAX_PER_USER", "2"))
+RECOGNITION_RETRY_AFTER_SECONDS = os.getenv("RECOGNITION_RETRY_AFTER_SECONDS", "1")
+
+# In-memory lesson practice sessions used by the check-progress endpoint
+PRACTICE_SESSION_MAX = int(os.getenv("PRACTICE_SESSION_MAX", "10000"))
+PRACTICE_SESSION_TTL_SECONDS = float(os.getenv("PRACTICE_SESSION_TTL_SECONDS", "900"))
@@ -1,10 +1,13 @@
-from fastapi import Depends, HTTPException, status, Header
+from typing import Optional
+from fastapi import Depends, HTTPException, Request, status, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from app.main import async_session
 from app.auth import decode_access_token
-from app.models import Account, Sign
+from app.models import Sign
+from app.services.principals import Principal, TokenClaims, load_principal
+from app.services.curriculum import curriculum_cache
 from fastapi.security import OAuth2PasswordBearer
 from app.auth import verify_access_token
 
@@ -15,20 +18,35 @@ async def get_db():
     async with async_session() as session:
         yield session
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db)
-) -> Account:
+def claims_from_token(token: str) -> Optional[TokenClaims]:
     payload = decode_access_token(token)
     if not payload or "sub" not in payload:
+        return None
+    try:
+        return TokenClaims(user_id=int(payload["sub"]), role=payload.get("role"))
+    except (TypeError, ValueError):
+        return None
+
+async def get_token_claims(token: str = Depends(oauth2_scheme)) -> TokenClaims:
+    """The verified token's user id and role, for handlers that need no more.
+
+    Unlike get_current_user this never touches the DB, so it does not notice
+    an account deleted since the token was issued.
+    """
+    claims = claims_from_token(token)
+    if not claims:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, 
             detail="Invalid authentication credentials"
         )
-    
-    user_id = payload["sub"]
-    result = await db.execute(select(Account).where(Account.user_id == user_id))
-    user = result.scalars().first()
+    return claims
+
+async def get_current_user(
+    claims: TokenClaims = Depends(get_token_claims),
+    db: AsyncSession = Depends(get_db)
+) -> Principal:
+    # Served from the principal cache; the session only connects on a miss
+    user = await load_principal(db, claims.user_id)
     
     if not user:
         raise HTTPException(
@@ -37,6 +55,13 @@ async def get_current_user(
         )
     return user
 
+async def get_user_from_token(token: str, db: AsyncSession) -> Optional[Principal]:
+    """Resolve a bearer token to its principal without raising, for WebSockets."""
+    claims = claims_from_token(token)
+    if not claims:
+        return None
+    return await load_principal(db, claims.user_id)
+
 async def add_video_to_sign(db: AsyncSession, sign_id: int, video_filename: str):
     r2_url_prefix = "https://10bbfdc0897bf4e826451e6e6054ffff.r2.cloudflarestorage.com/senya-videos/"
     full_video_url = f"{r2_url_prefix}{video_filename}"
@@ -51,11 +76,23 @@ async def add_video_to_sign(db: AsyncSession, sign_id: int, video_filename: str)
         raise Exception("Sign not found")
 
 async def get_admin_user(
-    current_user: Account = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     if current_user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized. Admin access required."
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+async def refresh_curriculum(request: Request, db: AsyncSession = Depends(get_db)):
+    """Router dependency for admin content routes: once a write succeeds,
+    rebuild the curriculum snapshot the learner endpoints serve."""
+    yield
+    if request.method in ("GET", "HEAD"):
+        return
+    try:
+        await curriculum_cache.rebuild(db)
+    except Exception as e:
+        # The old snapshot stays current until the TTL forces another rebuild
+        print(f"❌ Failed to rebuild curriculum snapshot: {e}")
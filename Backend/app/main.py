@@ -1,22 +1,46 @@
+import asyncio
 import uvicorn
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from app.config import DATABASE_URL
-from app import models
+from app.config import (
+    DATABASE_URL,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_ECHO,
+    SCHEMA_CHECK,
+)
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+from app.services.db_pool import InstrumentedPool
+from app.services.schema import check_schema_revision
 import os
 from pathlib import Path
 
-engine = create_async_engine(DATABASE_URL, echo=True, future=True)
+engine = create_async_engine(
+    DATABASE_URL,
+    echo=DB_ECHO,
+    future=True,
+    poolclass=InstrumentedPool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_pre_ping=DB_POOL_PRE_PING,
+    pool_recycle=DB_POOL_RECYCLE,
+)
 async_session = sessionmaker(
     bind=engine, class_=AsyncSession, expire_on_commit=False
 )
 
 app = FastAPI(title="Senya Sign Language App")
 
-from app.routes import ( practice_routes, auth_routes, lessons_routes, shop_routes, profile_routes, admin_units, admin_lessons, admin_signs, user_routes, admin_analytics )
+from app.routes import ( practice_routes, auth_routes, lessons_routes, shop_routes, profile_routes, admin_units, admin_lessons, admin_signs, user_routes, admin_analytics, admin_models, admin_metrics, recognition_routes, dashboard_routes )
+from app.services import recognition_service
+from app.dependencies import refresh_curriculum
+from app.auth import password_hasher
 
 
 app.add_middleware(
@@ -33,21 +57,36 @@ app.mount("/static", StaticFiles(directory=static_dir), name="static")
 
 
 app.include_router(practice_routes.router, prefix="/api/practice", tags=["Practice"])
-app.include_router(admin_units.router, prefix="/api/admin/units", tags=["Admin Units"])
-app.include_router(admin_lessons.router, prefix="/api/admin/lessons", tags=["Admin Lessons"])
-app.include_router(admin_signs.router, prefix="/api/admin/signs", tags=["Admin Signs"])
+app.include_router(admin_units.router, prefix="/api/admin/units", tags=["Admin Units"], dependencies=[Depends(refresh_curriculum)])
+app.include_router(admin_lessons.router, prefix="/api/admin/lessons", tags=["Admin Lessons"], dependencies=[Depends(refresh_curriculum)])
+app.include_router(admin_signs.router, prefix="/api/admin/signs", tags=["Admin Signs"], dependencies=[Depends(refresh_curriculum)])
 app.include_router(admin_analytics.router, prefix="/api/admin/analytics", tags=["Admin Analytics"]) 
+app.include_router(admin_models.router, prefix="/api/admin/models", tags=["Admin Models"])
+app.include_router(admin_metrics.router, prefix="/api/admin/metrics", tags=["Admin Metrics"])
 app.include_router(auth_routes.router, prefix="/api/auth", tags=["Auth"])
 app.include_router(lessons_routes.router, prefix="/api/lessons", tags=["Lessons"])
 app.include_router(user_routes.router, prefix="/api/status", tags=["Status"])
+app.include_router(dashboard_routes.router, prefix="/api/dashboard", tags=["Dashboard"])
 app.include_router(profile_routes.router, prefix="/api/profile", tags=["Profile"])
 app.include_router(shop_routes.router, prefix="/api/shop", tags=["Shop"])
+app.include_router(recognition_routes.router, prefix="/api/recognition", tags=["Recognition"])
 
 
 @app.on_event("startup")
 async def on_startup():
-    async with engine.begin() as conn:
-        await conn.run_sync(models.Base.metadata.create_all)
+    # The schema is managed with Alembic (see alembic.ini); only check it here
+    if SCHEMA_CHECK != "off":
+        await check_schema_revision(engine, strict=SCHEMA_CHECK == "strict")
+    recognition_service.start_model_loading()
+    # One probe hash on a bcrypt thread, so the effective cost shows in metrics
+    asyncio.get_running_loop().run_in_executor(password_hasher.executor, password_hasher.measure_cost)
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    recognition_service.shutdown_model()
+    password_hasher.executor.shutdown(wait=False)
+    await engine.dispose()
 
 
 if __name__ == "__main__":
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, Enum, ForeignKey, Boolean, JSON
+from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, Enum, ForeignKey, Boolean, JSON, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -26,6 +26,9 @@ class Unit(Base):
 
 class Lesson(Base):
     __tablename__ = 'lessons'
+    __table_args__ = (
+        Index('ix_lessons_unit_archived_order', 'unit_id', 'archived', 'order_index'),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     unit_id = Column(Integer, ForeignKey('units.id'), nullable=False)
@@ -52,6 +55,10 @@ class Lesson(Base):
 
 class Sign(Base):
     __tablename__ = 'signs'
+    __table_args__ = (
+        Index('ix_signs_lesson_archived', 'lesson_id', 'archived'),
+        Index('ix_signs_difficulty_archived', 'difficulty_level', 'archived'),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     lesson_id = Column(Integer, ForeignKey('lessons.id'), nullable=False)
@@ -68,6 +75,10 @@ class Sign(Base):
 
 class UserProgress(Base):
     __tablename__ = 'user_progress'
+    __table_args__ = (
+        # One row per user and lesson; also serves lookups by user_id alone
+        Index('uq_user_progress_user_lesson', 'user_id', 'lesson_id', unique=True),
+    )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey('accounts.user_id'))
@@ -117,7 +128,7 @@ class HeartPackage(Base):
     __tablename__ = 'heart_packages'
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, nullable=False)
+    name = Column(String(255), nullable=False)
     hearts_amount = Column(Integer, nullable=False)
     ruby_cost = Column(Integer, nullable=False)
 
@@ -153,6 +164,9 @@ class PracticeGame(Base):
 
 class UserPracticeProgress(Base):
     __tablename__ = 'user_practice_progress'
+    __table_args__ = (
+        Index('uq_user_practice_progress_user_level_game', 'user_id', 'level_id', 'game_id', unique=True),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey('accounts.user_id'))
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends
+from app.auth import password_hasher
+from app.dependencies import get_admin_user
+from app.main import engine
+from app.services.curriculum import curriculum_cache
+from app.services.principals import principal_cache
+
+router = APIRouter()
+
+@router.get("/")
+async def get_metrics(admin_user = Depends(get_admin_user)):
+    """Process-local counters; each worker process reports its own."""
+    return {
+        "db_pool": engine.pool.stats(),
+        "password_hashing": password_hasher.stats(),
+        "principal_cache": principal_cache.stats(),
+        "curriculum": curriculum_cache.stats(),
+    }
@@ -0,0 +1,123 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from app.config import RECOGNITION_BACKEND
+from app.dependencies import get_admin_user
+from app.services.model_backends import BACKENDS
+from app.services.recognition_service import registry, prediction_cache, admission
+
+router = APIRouter()
+
+class ModelLoadRequest(BaseModel):
+    path: str
+    backend: str = RECOGNITION_BACKEND
+    version: Optional[str] = None  # defaults to a hash of the model file
+    labels: Optional[List[str]] = None  # defaults to the model's manifest
+    input_size: Optional[List[int]] = Field(None, min_items=2, max_items=2)  # [width, height]
+    pool_workers: int = Field(0, ge=0)
+    activate: bool = False
+
+class CanaryRequest(BaseModel):
+    version: Optional[str] = None
+    percent: float = Field(0, ge=0, le=100)
+
+def get_version(version: str):
+    try:
+        return registry.get(version)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+
+@router.get("/")
+async def list_models(admin_user = Depends(get_admin_user)):
+    return registry.info()
+
+@router.get("/inference-stats")
+async def inference_stats(admin_user = Depends(get_admin_user)):
+    """Per-version batcher and latency histograms, cache and admission counters."""
+    return {
+        "versions": {
+            version: model_version.stats()
+            for version, model_version in registry.versions.items()
+        },
+        "cache": prediction_cache.stats(),
+        "admission": admission.stats(),
+    }
+
+@router.post("/", status_code=status.HTTP_202_ACCEPTED)
+async def load_model(
+    request: ModelLoadRequest,
+    admin_user = Depends(get_admin_user)
+):
+    """Register a model file and load and warm it up in the background.
+
+    Poll GET / until the version is ready, then activate it or send it
+    canary traffic; with ``activate`` it goes live as soon as it is warm.
+    """
+    if request.backend not in BACKENDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown backend '{request.backend}', expected one of: {', '.join(BACKENDS)}",
+        )
+    try:
+        model_version = await registry.register(
+            request.backend,
+            request.path,
+            version=request.version,
+            labels=request.labels,
+            input_size=tuple(request.input_size) if request.input_size else None,
+            pool_workers=request.pool_workers,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except OSError as e:
+        raise HTTPException(status_code=400, detail=f"Cannot read model: {str(e)}")
+
+    registry.load_in_background(model_version, activate=request.activate)
+    return model_version.info()
+
+@router.post("/{version}/activate")
+async def activate_model(
+    version: str,
+    retire_previous: bool = Query(True, description="Unload the replaced version once drained"),
+    admin_user = Depends(get_admin_user)
+):
+    """Atomically route all traffic to a ready version."""
+    get_version(version)
+    try:
+        previous = registry.activate(version)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if previous is not None and retire_previous:
+        registry.retire_in_background(previous)
+    return registry.info()
+
+@router.put("/canary")
+async def set_canary(
+    request: CanaryRequest,
+    admin_user = Depends(get_admin_user)
+):
+    """Send a percentage of traffic to a ready candidate; 0 turns it off.
+
+    Compare the candidate's latency histogram with the active version's in
+    /api/admin/models/inference-stats before activating it.
+    """
+    if request.version and request.percent > 0:
+        get_version(request.version)
+    try:
+        registry.set_canary(request.version, request.percent)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return registry.info()
+
+@router.delete("/{version}")
+async def unload_model(
+    version: str,
+    admin_user = Depends(get_admin_user)
+):
+    """Unload a version that is not active, after its in-flight requests drain."""
+    model_version = get_version(version)
+    try:
+        await registry.retire(model_version)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"detail": f"Model version '{version}' unloaded"}
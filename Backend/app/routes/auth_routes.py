@@ -3,7 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas import UserSignup, UserLogin, AdminLogin, AccountResponseSchema
 from app.models import Account, UserProfile
 from app.dependencies import get_db
-from app.auth import hash_password, verify_password, create_access_token
+from app.auth import hash_password_async, verify_password_async, create_access_token
 from sqlalchemy.future import select
 from datetime import datetime
 
@@ -18,7 +18,7 @@ async def signup(user: UserSignup, db: AsyncSession = Depends(get_db)):
     new_account = Account(
         name=user.name,
         email=user.email,
-        hash_password=hash_password(user.password),
+        hash_password=await hash_password_async(user.password),
         role="user"
     )
     db.add(new_account)
@@ -35,7 +35,7 @@ async def signup(user: UserSignup, db: AsyncSession = Depends(get_db)):
 async def login(user: UserLogin, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(Account).where(Account.email == user.email))
     account = result.scalars().first()
-    if not account or not verify_password(user.password, account.hash_password):
+    if not account or not await verify_password_async(user.password, account.hash_password):
         raise HTTPException(status_code=400, detail="Incorrect credentials")
 
     account.last_login = datetime.utcnow()
@@ -59,7 +59,7 @@ async def login(user: UserLogin, db: AsyncSession = Depends(get_db)):
 async def admin_login(admin: AdminLogin, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(Account).where(Account.email == admin.email, Account.role == 'admin'))
     account = result.scalars().first()
-    if not account or not verify_password(admin.password, account.hash_password):
+    if not account or not await verify_password_async(admin.password, account.hash_password):
         raise HTTPException(status_code=400, detail="Incorrect credentials")
     
     account.last_login = datetime.utcnow()
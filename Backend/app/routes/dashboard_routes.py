@@ -0,0 +1,16 @@
+from fastapi import APIRouter, HTTPException, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.dependencies import get_db, get_current_user
+from app.schemas import DashboardResponse
+from app.services.dashboard import get_dashboard
+
+router = APIRouter(dependencies=[Depends(get_current_user)])
+
+@router.get("/{user_id}", response_model=DashboardResponse)
+async def get_user_dashboard(user_id: int, db: AsyncSession = Depends(get_db)):
+    """The home page in one request: status, units, lessons, locks and progress."""
+    dashboard = await get_dashboard(db, user_id)
+    if dashboard is None:
+        raise HTTPException(status_code=404, detail="User profile not found")
+    return dashboard
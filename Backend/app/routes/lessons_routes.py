@@ -1,72 +1,65 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload, contains_eager
+from sqlalchemy.orm import selectinload
 from datetime import datetime, timedelta
 
 from app.models import (
-    Lesson, Unit, Sign, UserProgress, UserProfile, Account
+    Lesson, UserProgress, UserProfile, Account
 )
 from app.dependencies import get_db, get_current_user
+from app.config import CURRICULUM_CACHE_CONTROL
+from app.services.curriculum import get_curriculum
+from app.services.http_cache import conditional_response
+from app.services.practice_sessions import session_store
+from app.services.unit_progress import (
+    get_unit_lock_states,
+    get_units_progress,
+    lesson_progress_per_unit,
+    unit_progress_summary,
+)
 from app.schemas import (
     LessonResponseSchema,
     ProgressUpdateSchema,
     ProgressResponseSchema,
     UnitWithLessonsSchema,
     UserProgressSchema,
-    UnitProgressResponse
+    UnitProgressResponse,
+    UnitProgressItemResponse
 )
 
 router = APIRouter()
 
 @router.get("/units/", response_model=List[UnitWithLessonsSchema])
 async def get_units(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     current_user: Account = Depends(get_current_user)
 ):
-    result = await db.execute(
-        select(Unit)
-        .outerjoin(Unit.lessons)
-        .options(contains_eager(Unit.lessons))
-        .where(Unit.archived == False)
-        .where(Lesson.archived == False)
-        .order_by(Unit.order_index, Lesson.order_index)
-    )
-    return result.scalars().unique().all()
+    snapshot = await get_curriculum(db)
+    return conditional_response(request, snapshot.bodies["units"], CURRICULUM_CACHE_CONTROL)
 
 @router.get("/", summary="List all lessons", response_model=List[LessonResponseSchema])
 async def list_lessons(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     current_user: Account = Depends(get_current_user)
 ):
-    result = await db.execute(
-        select(Lesson)
-        .where(Lesson.archived == False)
-        .order_by(Lesson.order_index)
-    )
-    return result.scalars().all()
+    snapshot = await get_curriculum(db)
+    return conditional_response(request, snapshot.bodies["lessons"], CURRICULUM_CACHE_CONTROL)
 
 @router.get("/{lesson_id}", response_model=LessonResponseSchema)
 async def get_lesson(
     lesson_id: int, 
+    request: Request,
     db: AsyncSession = Depends(get_db),
 ):
-    lesson_result = await db.execute(
-        select(Lesson)
-        .outerjoin(Lesson.signs)
-        .options(
-            contains_eager(Lesson.signs),
-        )
-        .where(Lesson.id == lesson_id)
-        .where(Lesson.archived == False)
-        .where(Sign.archived == False)
-    )
-    lesson = lesson_result.scalars().first()
-    if not lesson:
+    cached = (await get_curriculum(db)).bodies.get(f"lesson:{lesson_id}")
+    if not cached:
         raise HTTPException(status_code=404, detail="Lesson not found")
-    lesson.video_url = lesson.signs[0].video_url if lesson.signs else None
-    return lesson
+    return conditional_response(request, cached, CURRICULUM_CACHE_CONTROL)
 
 @router.get("/user-progress/{user_id}/{lesson_id}", response_model=UserProgressSchema)
 async def get_user_progress(
@@ -120,6 +113,15 @@ async def refresh_hearts(
     await db.commit()
     return {"user_id": profile.user_id, "hearts": profile.hearts}
 
+@router.get("/unit-status/{user_id}", response_model=List[dict])
+async def get_unit_statuses(
+    user_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: Account = Depends(get_current_user)
+):
+    """Lock state of every unit, for rendering the whole course map at once."""
+    return await get_unit_lock_states(db, user_id)
+
 @router.get("/unit-status/{user_id}/{unit_id}", response_model=dict)
 async def get_unit_status(
     user_id: int, 
@@ -127,53 +129,11 @@ async def get_unit_status(
     db: AsyncSession = Depends(get_db),
     current_user: Account = Depends(get_current_user)
 ):
-    current_unit = (await db.execute(
-        select(Unit)
-        .where(Unit.id == unit_id, Unit.archived == False)
-    )).scalars().first()
-    
-    if not current_unit:
-        raise HTTPException(status_code=404, detail="Unit not found")
-    
-    if current_unit.order_index == 0:
-        return {"is_locked": False}
-    
-    previous_unit = (await db.execute(
-        select(Unit)
-        .where(
-            Unit.order_index < current_unit.order_index,
-            Unit.archived == False
-        )
-        .order_by(Unit.order_index.desc())
-        .limit(1)
-    )).scalars().first()
-    
-    if not previous_unit:
-        return {"is_locked": False}
-    
-    lessons = (await db.execute(
-        select(Lesson)
-        .where(Lesson.unit_id == previous_unit.id, Lesson.archived == False)
-    )).scalars().all()
-    
-    if not lessons:
-        return {"is_locked": True, "reason": "Previous unit has no lessons"}
-    
-    all_completed = True
-    for lesson in lessons:
-        prog = (await db.execute(
-            select(UserProgress)
-            .where(
-                UserProgress.user_id == user_id,
-                UserProgress.lesson_id == lesson.id
-            )
-        )).scalars().first()
-        
-        if not prog or not prog.completed:
-            all_completed = False
-            break
-    
-    return {"is_locked": not all_completed}
+    for state in await get_unit_lock_states(db, user_id):
+        if state["unit_id"] == unit_id:
+            state.pop("unit_id")
+            return state
+    raise HTTPException(status_code=404, detail="Unit not found")
 
 @router.get("/lesson-status/{user_id}/{lesson_id}", response_model=dict)
 async def get_lesson_status(
@@ -182,38 +142,19 @@ async def get_lesson_status(
     db: AsyncSession = Depends(get_db),
     current_user: Account = Depends(get_current_user)
 ):
-    lesson = (await db.execute(
-        select(Lesson).where(Lesson.id == lesson_id)
-    )).scalars().first()
-    if not lesson:
+    position = (await get_curriculum(db)).positions.get(lesson_id)
+    if not position:
         raise HTTPException(status_code=404, detail="Lesson not found")
 
-    first_lesson = (await db.execute(
-        select(Lesson)
-        .where(Lesson.unit_id == lesson.unit_id)
-        .order_by(Lesson.order_index)
-        .limit(1)
-    )).scalars().first()
-    if first_lesson and first_lesson.id == lesson_id:
-        return {"is_locked": False}
-
-    prev = (await db.execute(
-        select(Lesson)
-        .where(
-            Lesson.unit_id == lesson.unit_id,
-            Lesson.order_index < lesson.order_index
-        )
-        .order_by(Lesson.order_index.desc())
-        .limit(1)
-    )).scalars().first()
-    if not prev:
+    # The first lesson of a unit has no previous lesson and is always open
+    if position.previous_lesson_id is None:
         return {"is_locked": False}
 
     prog = (await db.execute(
         select(UserProgress)
         .where(
             UserProgress.user_id == user_id,
-            UserProgress.lesson_id == prev.id
+            UserProgress.lesson_id == position.previous_lesson_id
         )
     )).scalars().first()
     return {"is_locked": not (prog and prog.completed)}
@@ -241,16 +182,13 @@ async def update_progress(
         ).scalars().first()
         if not lesson:
             raise HTTPException(404, "Lesson not found or archived")
+        rubies_reward = lesson.rubies_reward
 
-        up = (
-            await db.execute(
-                select(UserProgress)
-                .where(
-                    UserProgress.user_id == user_id,
-                    UserProgress.lesson_id == lesson_id
-                )
-            )
-        ).scalars().first()
+        progress_query = select(UserProgress).where(
+            UserProgress.user_id == user_id,
+            UserProgress.lesson_id == lesson_id
+        )
+        up = (await db.execute(progress_query)).scalars().first()
         if not up:
             up = UserProgress(
                 user_id=user_id,
@@ -260,6 +198,12 @@ async def update_progress(
                 last_question=0
             )
             db.add(up)
+            try:
+                await db.flush()
+            except IntegrityError:
+                # A concurrent first update created it; uq_user_progress_user_lesson kept it single
+                await db.rollback()
+                up = (await db.execute(progress_query)).scalars().one()
 
         new_prog = max(0, min(progress_data.progress, 100))
         up.progress = new_prog
@@ -280,8 +224,8 @@ async def update_progress(
         next_unlocked = False
         if new_prog >= 100 and not up.completed:
             up.completed = True
-            profile.rubies += lesson.rubies_reward
-            rubies_earned = lesson.rubies_reward
+            profile.rubies += rubies_reward
+            rubies_earned = rubies_reward
 
             today = datetime.utcnow().date()
             last_date = (
@@ -297,14 +241,12 @@ async def update_progress(
                 profile.streak = 1
             profile.last_lesson_date = datetime.utcnow()
 
-            nxt = (
-                await db.execute(
-                    select(Lesson).where(Lesson.id == lesson.id + 1)
-                )
-            ).scalars().first()
-            next_unlocked = bool(nxt)
+            position = (await get_curriculum(db)).positions.get(lesson_id)
+            next_unlocked = bool(position and position.next_lesson_id)
 
         await db.commit()
+        # Progress moved outside recognition; reload the practice session
+        session_store.end(user_id, lesson_id)
 
         return {
             "progress": up.progress,
@@ -322,6 +264,15 @@ async def update_progress(
         raise HTTPException(500, "Could not update progress")
 
 
+@router.get("/unit-progress/{user_id}", response_model=List[UnitProgressItemResponse], status_code=status.HTTP_200_OK)
+async def get_all_unit_progress(
+    user_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: Account = Depends(get_current_user)
+):
+    """Progress of every unit, for the home screen in one request."""
+    return await get_units_progress(db, user_id)
+
 @router.get("/unit-progress/{user_id}/{unit_id}", response_model=UnitProgressResponse, status_code=status.HTTP_200_OK)
 async def get_unit_progress(
     user_id: int, 
@@ -329,37 +280,8 @@ async def get_unit_progress(
     db: AsyncSession = Depends(get_db),
     current_user: Account = Depends(get_current_user)
 ):
-    lessons = (await db.execute(
-        select(Lesson)
-        .where(Lesson.unit_id == unit_id, Lesson.archived == False)
-    )).scalars().all()
-    if not lessons:
-        return UnitProgressResponse(
-            progress_percentage=0.0,
-            completed_lessons=0,
-            total_lessons=0
-        )
-
-    total = 0
-    completed = 0
-    for lesson in lessons:
-        prog = (await db.execute(
-            select(UserProgress)
-            .where(
-                UserProgress.user_id == user_id,
-                UserProgress.lesson_id == lesson.id
-            )
-        )).scalars().first()
-        if prog:
-            total += prog.progress
-            if prog.completed:
-                completed += 1
-
-    return UnitProgressResponse(
-        progress_percentage=total / len(lessons),
-        completed_lessons=completed,
-        total_lessons=len(lessons)
-    )
+    counts = await lesson_progress_per_unit(db, user_id, unit_id=unit_id)
+    return UnitProgressResponse(**unit_progress_summary(counts.get(unit_id)))
 
 # This endpoint is causing the 401 error - update it to make it public
 @router.get("/lesson-progress/{user_id}/{lesson_id}", response_model=dict)
@@ -1,14 +1,17 @@
 # app/routers/practice_routes.py
 
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from typing import List, Dict, Any
 import traceback
 
 from app.dependencies import get_db, get_current_user
+from app.config import CURRICULUM_CACHE_CONTROL
+from app.services.curriculum import get_curriculum
+from app.services.http_cache import conditional_response
 from app.services.practice_service import (
-    get_practice_signs,
+    practice_difficulty,
     update_progress,
     get_practice_levels
 )
@@ -23,11 +26,12 @@ router = APIRouter(dependencies=[Depends(get_current_user)])
 
 
 @router.get("/signs/{user_id}/{difficulty}", response_model=List[Dict[str, Any]])
-async def get_signs(user_id: int, difficulty: str, db: AsyncSession = Depends(get_db)):
+async def get_signs(user_id: int, difficulty: str, request: Request, db: AsyncSession = Depends(get_db)):
     """Get signs for a specific difficulty level"""
     try:
-        signs = await get_practice_signs(db, user_id, difficulty)
-        return signs
+        snapshot = await get_curriculum(db)
+        cached = snapshot.bodies[f"signs:{practice_difficulty(difficulty)}"]
+        return conditional_response(request, cached, CURRICULUM_CACHE_CONTROL)
     except Exception as e:
         print(f"Error getting signs by difficulty: {str(e)}")
         print(traceback.format_exc())
@@ -6,7 +6,8 @@ from sqlalchemy.future import select
 from app.dependencies import get_db, get_current_user
 from app.models import Account, UserProfile
 from app.schemas import UserProfileUpdate
-from app.auth import hash_password
+from app.auth import hash_password_async
+from app.services.principals import invalidate_principal
 import os, uuid
 import shutil
 from pathlib import Path
@@ -61,7 +62,7 @@ async def update_profile(
     if update.email is not None:
         account.email = update.email
     if update.password is not None:
-        account.hash_password = hash_password(update.password)
+        account.hash_password = await hash_password_async(update.password)
 
     prof_res = await db.execute(select(UserProfile).where(UserProfile.user_id == user_id))
     profile = prof_res.scalars().first()
@@ -72,6 +73,7 @@ async def update_profile(
         profile.profile_url = update.profile_url
 
     await db.commit()
+    invalidate_principal(user_id)
     return {"msg": "Profile updated successfully"}
 
 @router.post("/{user_id}/upload-profile-picture", summary="Upload Profile Picture")
@@ -1,87 +1,225 @@
-from fastapi import APIRouter, HTTPException, Request, Depends, File, UploadFile
+from fastapi import (
+    APIRouter, HTTPException, Request, Depends, File, UploadFile,
+    WebSocket, WebSocketDisconnect, Query, status,
+)
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
+from starlette.datastructures import UploadFile as FormFile
 from pydantic import BaseModel
-import numpy as np
-import cv2
+import asyncio
 import base64
-import tensorflow as tf
-from app.dependencies import get_db, get_current_user
-from app.models import Sign, UserProgress, Lesson
+import json
+from app.main import async_session
+try:
+    from websockets.exceptions import ConnectionClosed
+except ImportError:  # uvicorn running without the websockets implementation
+    ConnectionClosed = WebSocketDisconnect
+from app.config import RECOGNITION_RETRY_AFTER_SECONDS, RECOGNITION_BATCH_MAX_FRAMES
+from app.dependencies import (
+    get_db, get_current_user, get_token_claims, get_user_from_token, claims_from_token,
+)
+from app.models import Sign
+from app.services import recognition_service
+from app.services.recognition_service import (
+    recognize,
+    recognize_many,
+    route_model,
+    run_in_inference_executor,
+    vote,
+    ModelUnavailableError,
+)
+from app.services.admission import REJECT_USER
+from app.services.practice_sessions import (
+    session_store,
+    load_practice_session,
+    save_practice_progress,
+)
 
 router = APIRouter()
 
-# Global variable to store the model
-model = None
+# Seconds a client should wait before retrying while the model warms up
+MODEL_RETRY_AFTER = "5"
+
+BINARY_CONTENT_TYPES = ("application/octet-stream", "image/jpeg", "image/png")
 
 class ImageRequest(BaseModel):
     image: str  # Base64 encoded image
 
-async def load_recognition_model():
-    """Load the TensorFlow model for sign recognition."""
-    global model
+def model_unavailable(reason: str) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail=f"Model not ready: {reason}",
+        headers={"Retry-After": MODEL_RETRY_AFTER},
+    )
+
+async def require_model_ready():
+    """Reject recognition requests before any decoding or DB work while warming up."""
+    active = recognition_service.registry.active
+    if active is None:
+        raise model_unavailable(f"model is {recognition_service.registry.status()}")
+    if not active.healthy:
+        raise model_unavailable("recognition workers are restarting")
+
+def admission_key(request: Request):
+    """Per-user limit key: the token subject, or None for anonymous callers.
+
+    Only the JWT signature is checked here; the endpoint's own auth
+    dependency still validates the account. Anonymous callers are not keyed
+    by address, which behind the reverse proxy or a NAT would put them all
+    in one per-user bucket; the global cap bounds them instead.
+    """
+    authorization = request.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        claims = claims_from_token(authorization[7:])
+        if claims:
+            return ("user", claims.user_id)
+    return None
+
+def admission_rejected(reason: str) -> HTTPException:
+    if reason == REJECT_USER:
+        return HTTPException(
+            status_code=429,
+            detail="Too many recognition requests in flight for this user",
+            headers={"Retry-After": RECOGNITION_RETRY_AFTER_SECONDS},
+        )
+    return HTTPException(
+        status_code=503,
+        detail="Recognition is at capacity, try again shortly",
+        headers={"Retry-After": RECOGNITION_RETRY_AFTER_SECONDS},
+    )
+
+async def admit_recognition(request: Request):
+    """Hold an admission slot for the duration of the request."""
+    key = admission_key(request)
+    reason = recognition_service.admission.try_acquire(key)
+    if reason:
+        raise admission_rejected(reason)
     try:
-        model = tf.keras.models.load_model('models/model.h5')
-        print("✅ ASL Recognition model loaded successfully!")
-        return True
-    except Exception as e:
-        print(f"❌ Failed to load ASL Recognition model: {e}")
-        model = None
-        return False
+        yield
+    finally:
+        recognition_service.admission.release(key)
+
+RECOGNITION_DEPENDENCIES = [Depends(require_model_ready), Depends(admit_recognition)]
 
 @router.get("/model-status")
 async def model_status():
-    """Check if the ML model is loaded."""
-    global model
-    is_loaded = model is not None
-    return {"model_loaded": is_loaded}
+    """Readiness probe: 200 once the model is loaded and warmed up, else 503.
 
-@router.post("/predict")
+    Model paths, load errors and serving stats are admin-only, under
+    /api/admin/models.
+    """
+    active = recognition_service.registry.active
+    is_loaded = active is not None and active.healthy
+    return JSONResponse(
+        status_code=200 if is_loaded else 503,
+        content={
+            "model_loaded": is_loaded,
+            "version": active.version if is_loaded else None,
+        },
+    )
+
+@router.post("/predict", dependencies=RECOGNITION_DEPENDENCIES)
 async def predict_sign(request: ImageRequest):
     """Predict the sign from a base64 encoded image."""
-    global model
-    if model is None:
-        try:
-            await load_recognition_model()
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Model not loaded: {str(e)}")
-    
     try:
-        # Decode base64 image
         img_data = base64.b64decode(request.image)
-        
-        # Convert to numpy array
-        nparr = np.frombuffer(img_data, np.uint8)
-        img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        
-        # Preprocess the image
-        img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        img = cv2.resize(img, (224, 224))  # Resize to match model input size
-        img = img / 255.0  # Normalize
-        
-        # Add batch dimension
-        img = np.expand_dims(img, axis=0)
-        
-        # Make prediction
-        prediction = model.predict(img)
-        
-        # Get the highest probability class
-        predicted_class_index = np.argmax(prediction[0])
-        confidence = float(prediction[0][predicted_class_index])
-        
-        # Map index to letter (assuming ASL alphabet A-Z)
-        letters = "abcdefghijklmnopqrstuvwxyz"
-        if 0 <= predicted_class_index < len(letters):
-            letter = letters[predicted_class_index]
-        else:
-            letter = "unknown"
-        
-        return {"letter": letter, "confidence": confidence}
-    
+        return await recognize(img_data)
+    except ModelUnavailableError as e:
+        raise model_unavailable(str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+
+@router.post("/predict-binary", dependencies=RECOGNITION_DEPENDENCIES)
+async def predict_sign_binary(request: Request):
+    """Predict the sign from a raw request body instead of base64 JSON.
+
+    The body is either an encoded JPEG/PNG or an RGB uint8 buffer already
+    at the model's input size (224x224 by default); the response matches
+    /predict.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type not in BINARY_CONTENT_TYPES:
+        raise HTTPException(
+            status_code=415,
+            detail=f"Expected one of: {', '.join(BINARY_CONTENT_TYPES)}",
+        )
+
+    body = await request.body()
+    if not body:
+        raise HTTPException(status_code=400, detail="Empty request body")
+
+    try:
+        return await recognize(body)
+    except ModelUnavailableError as e:
+        raise model_unavailable(str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+
+@router.post("/predict-batch", dependencies=RECOGNITION_DEPENDENCIES)
+async def predict_sign_batch(
+    request: Request,
+    top_k: int = Query(3, ge=1)
+):
+    """Predict every frame of a short burst in one model batch.
+
+    Accepts multipart form data with one or more ``files`` parts (JPEG,
+    PNG or raw frames), or an application/octet-stream body of N packed
+    raw RGB uint8 frames at the model's input size (224x224 by default).
+    Returns per-frame results in order plus a top-k vote over the burst.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type == "multipart/form-data":
+        form = await request.form()
+        uploads = form.getlist("files")
+        # Checked before any part is read into memory
+        if len(uploads) > RECOGNITION_BATCH_MAX_FRAMES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"At most {RECOGNITION_BATCH_MAX_FRAMES} frames per request",
+            )
+        if not all(isinstance(upload, FormFile) for upload in uploads):
+            raise HTTPException(status_code=400, detail="Every 'files' part must be a file upload")
+        items = [await upload.read() for upload in uploads]
+    elif content_type == "application/octet-stream":
+        body = await request.body()
+        items = None
+    else:
+        raise HTTPException(
+            status_code=415,
+            detail="Expected multipart/form-data or application/octet-stream",
+        )
+
+    try:
+        with route_model().serving() as model_version:
+            # Packed frames are viewed in place; encoded ones are counted
+            # before any decoding happens.
+            frames = model_version.unpack(body) if items is None else None
+            count = len(frames) if items is None else len(items)
+            if count == 0:
+                raise HTTPException(status_code=400, detail="No frames submitted")
+            if count > RECOGNITION_BATCH_MAX_FRAMES:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"At most {RECOGNITION_BATCH_MAX_FRAMES} frames per request",
+                )
+            if frames is None:
+                frames = await run_in_inference_executor(model_version.prepare_many, items)
+            probabilities = await recognize_many(model_version, frames)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ModelUnavailableError as e:
+        raise model_unavailable(str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
 
-@router.post("/check-sign/{sign_id}")
+    return {
+        "frames": [model_version.format_prediction(row) for row in probabilities],
+        "top_k": vote(model_version, probabilities, top_k),
+    }
+
+@router.post("/check-sign/{sign_id}", dependencies=RECOGNITION_DEPENDENCIES)
 async def check_sign(
     sign_id: int, 
     request: ImageRequest, 
@@ -107,124 +245,207 @@ async def check_sign(
         "expected_letter": sign.text
     }
 
-@router.post("/lessons/{lesson_id}/check-progress")
+@router.post("/lessons/{lesson_id}/check-progress", dependencies=RECOGNITION_DEPENDENCIES)
 async def check_lesson_progress(
     lesson_id: int,
     request: ImageRequest,
     db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
-    """Check a user's sign against their current lesson progress."""
-    # Get current lesson
-    result = await db.execute(select(Lesson).where(Lesson.id == lesson_id))
-    lesson = result.scalars().first()
-    if not lesson:
-        raise HTTPException(status_code=404, detail="Lesson not found")
-    
-    # Get current user progress
-    result = await db.execute(
-        select(UserProgress).where(
-            UserProgress.user_id == current_user["id"],
-            UserProgress.lesson_id == lesson_id
-        )
-    )
-    user_progress = result.scalars().first()
-    
-    # If no progress record exists, create one
-    if not user_progress:
-        user_progress = UserProgress(
-            user_id=current_user["id"],
-            lesson_id=lesson_id,
-            progress=0,
-            completed=False,
-            last_question=0
-        )
-        db.add(user_progress)
-        await db.commit()
-        await db.refresh(user_progress)
-    
+    """Check a user's sign against their current lesson progress.
+
+    The lesson's signs and the user's position are held in a practice
+    session, so frames that don't advance it never touch the database.
+    """
+    user_id = current_user.user_id
+    session = session_store.get(user_id, lesson_id)
+    if session is None:
+        session = await load_practice_session(db, user_id, lesson_id)
+        if not session:
+            raise HTTPException(status_code=404, detail="Lesson not found")
+        session_store.put(session)
+
     # Get the current sign based on progress
-    current_sign_index = user_progress.last_question
-    if current_sign_index >= len(lesson.signs):
+    current_index, current_sign = session.index, session.expected
+    if current_sign is None:
         return {"detail": "Lesson completed", "completed": True}
-    
-    current_sign = lesson.signs[current_sign_index]
-    
+
     # Analyze the image
     result = await predict_sign(request)
-    
+
     # Check if the detected letter matches the expected sign
-    is_correct = result["letter"].lower() == current_sign.text.lower()
-    
-    # Update progress if correct with good confidence
-    if is_correct and result["confidence"] > 0.70:
-        user_progress.last_question += 1
-        user_progress.progress = int((user_progress.last_question / len(lesson.signs)) * 100)
-        
-        # Check if lesson is complete
-        if user_progress.last_question >= len(lesson.signs):
-            user_progress.completed = True
-            
-            # Get user profile to update rubies
-            # Note: You'll need to implement this part based on your models
-            # This is a simplified example
-            if hasattr(current_user, "profile"):
-                current_user.profile.rubies += lesson.rubies_reward
-        
-        await db.commit()
-    
+    is_correct = result["letter"].lower() == current_sign.lower()
+
+    # Update progress if correct with good confidence, unless a concurrent
+    # frame already advanced past this sign
+    if is_correct and result["confidence"] > 0.70 and session.index == current_index:
+        session.index += 1
+        await save_practice_progress(db, session)
+
     return {
         "is_correct": is_correct,
         "confidence": result["confidence"],
         "detected_letter": result["letter"],
-        "expected_letter": current_sign.text,
-        "progress": user_progress.progress,
-        "completed": user_progress.completed
+        "expected_letter": current_sign,
+        "progress": session.progress,
+        "completed": session.completed
+    }
+
+@router.delete("/lessons/{lesson_id}/practice-session")
+async def end_practice_session(
+    lesson_id: int,
+    claims = Depends(get_token_claims)
+):
+    """Drop the cached practice session; progress is already saved."""
+    session = session_store.end(claims.user_id, lesson_id)
+    return {
+        "ended": session is not None,
+        "progress": session.progress if session else None,
+        "completed": session.completed if session else None
     }
 
-@router.post("/upload-image")
+@router.post("/upload-image", dependencies=RECOGNITION_DEPENDENCIES)
 async def upload_image(
     file: UploadFile = File(...),
     current_user = Depends(get_current_user)
 ):
     """Process an uploaded image file for sign recognition."""
-    global model
-    if model is None:
-        try:
-            await load_recognition_model()
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Model not loaded: {str(e)}")
-    
     try:
         contents = await file.read()
-        
-        # Convert to numpy array
-        nparr = np.frombuffer(contents, np.uint8)
-        img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        
-        # Preprocess the image
-        img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        img = cv2.resize(img, (224, 224))
-        img = img / 255.0
-        
-        # Add batch dimension
-        img = np.expand_dims(img, axis=0)
-        
-        # Make prediction
-        prediction = model.predict(img)
-        
-        # Get the highest probability class
-        predicted_class_index = np.argmax(prediction[0])
-        confidence = float(prediction[0][predicted_class_index])
-        
-        # Map index to letter (assuming ASL alphabet A-Z)
-        letters = "abcdefghijklmnopqrstuvwxyz"
-        if 0 <= predicted_class_index < len(letters):
-            letter = letters[predicted_class_index]
-        else:
-            letter = "unknown"
-        
-        return {"letter": letter, "confidence": confidence}
-    
+        return await recognize(contents)
+    except ModelUnavailableError as e:
+        raise model_unavailable(str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+
+class LatestFrame:
+    """Single-slot mailbox that only keeps the newest unprocessed frame."""
+
+    def __init__(self):
+        self.frame = None
+        self.dropped = 0
+        self.closed = False
+        self.ready = asyncio.Event()
+
+    def put(self, frame):
+        if self.frame is not None:
+            self.dropped += 1
+        self.frame = frame
+        self.ready.set()
+
+    def close(self):
+        self.closed = True
+        self.ready.set()
+
+    async def take(self):
+        """The newest pending frame; None once closed with nothing pending."""
+        while self.frame is None and not self.closed:
+            self.ready.clear()
+            await self.ready.wait()
+        frame, self.frame = self.frame, None
+        return frame
+
+# What sending raises once the client has gone: uvicorn's websockets
+# implementation raises ConnectionClosed, wsproto an OSError, and Starlette
+# a RuntimeError after the close message has been sent
+STREAM_CLOSED_ERRORS = (WebSocketDisconnect, ConnectionClosed, RuntimeError, OSError)
+
+async def send_stream_message(websocket: WebSocket, message) -> bool:
+    """Send one JSON message; False if the client is already gone."""
+    try:
+        await websocket.send_json(message)
+    except STREAM_CLOSED_ERRORS:
+        return False
+    return True
+
+def decode_stream_frame(message) -> bytes:
+    """Binary messages are raw frames; text is base64 or {"image": base64}."""
+    if isinstance(message, bytes):
+        return message
+    message = message.strip()
+    if message.startswith("{"):
+        message = json.loads(message)["image"]
+    return base64.b64decode(message)
+
+async def _receive_frames(websocket: WebSocket, mailbox: LatestFrame):
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            frame = message.get("bytes")
+            if frame is None:
+                frame = message.get("text")
+            if frame:
+                mailbox.put(frame)
+    finally:
+        mailbox.close()
+
+@router.websocket("/ws/check-sign/{sign_id}")
+async def check_sign_stream(
+    websocket: WebSocket,
+    sign_id: int,
+    token: str = Query(...)
+):
+    """Check a stream of frames against one expected sign.
+
+    Auth and the sign lookup happen once per connection. When frames arrive
+    faster than inference, only the newest pending frame is kept and the
+    rest are counted in ``dropped_frames``.
+    """
+    async with async_session() as db:
+        current_user = await get_user_from_token(token, db)
+        sign = await db.get(Sign, sign_id) if current_user else None
+
+    if not current_user:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    if not sign:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Sign not found")
+        return
+
+    await websocket.accept()
+    mailbox = LatestFrame()
+    receiver = asyncio.create_task(_receive_frames(websocket, mailbox))
+    admission = recognition_service.admission
+    admission_key = ("user", current_user.user_id)
+    processed = 0
+    try:
+        while True:
+            message = await mailbox.take()
+            if message is None:
+                break
+
+            # Each frame takes a slot like an HTTP request, so streams share
+            # the per-user and global caps; a rejected frame is dropped.
+            rejected = admission.try_acquire(admission_key)
+            if rejected:
+                reply = {
+                    "error": admission_rejected(rejected).detail,
+                    "retry_after": float(RECOGNITION_RETRY_AFTER_SECONDS),
+                }
+            else:
+                try:
+                    result = await recognize(decode_stream_frame(message))
+                except ModelUnavailableError as e:
+                    reply = {"error": f"Model not ready: {str(e)}"}
+                except Exception as e:
+                    reply = {"error": f"Prediction error: {str(e)}"}
+                else:
+                    processed += 1
+                    reply = {
+                        "is_correct": result["letter"].lower() == sign.text.lower(),
+                        "confidence": result["confidence"],
+                        "detected_letter": result["letter"],
+                        "expected_letter": sign.text,
+                        "frames_processed": processed,
+                        "dropped_frames": mailbox.dropped,
+                    }
+                finally:
+                    admission.release(admission_key)
+            if not await send_stream_message(websocket, reply):
+                break
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receiver.cancel()
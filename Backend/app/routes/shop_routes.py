@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from typing import List
 
+from app.config import CURRICULUM_CACHE_CONTROL
 from app.dependencies import get_db, get_current_user
 from app.models import UserProfile, HeartPackage
 from app.schemas import HeartPurchase, HeartPurchaseResponse, HeartPackage as HeartPackageSchema
+from app.services.curriculum import get_curriculum
+from app.services.http_cache import conditional_response
 
 router = APIRouter(dependencies=[Depends(get_current_user)])
 
@@ -47,7 +50,6 @@ async def purchase_hearts(
     }
 
 @router.get("/heart-packages", response_model=List[HeartPackageSchema])
-async def get_heart_packages(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(HeartPackage))
-    packages = result.scalars().all()
-    return packages
\ No newline at end of file
+async def get_heart_packages(request: Request, db: AsyncSession = Depends(get_db)):
+    snapshot = await get_curriculum(db)
+    return conditional_response(request, snapshot.bodies["heart_packages"], CURRICULUM_CACHE_CONTROL)
\ No newline at end of file
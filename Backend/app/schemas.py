@@ -154,6 +154,24 @@ class UnitProgressResponse(BaseModel):
     class Config:
         orm_mode = True
 
+class UnitProgressItemResponse(UnitProgressResponse):
+    unit_id: int
+
+class DashboardLessonSchema(LessonResponseSchema):
+    is_locked: bool
+    progress: int = 0
+    completed: bool = False
+
+class DashboardUnitSchema(UnitSchema):
+    is_locked: bool
+    reason: Optional[str] = None
+    progress: UnitProgressResponse
+    lessons: List[DashboardLessonSchema] = []
+
+class DashboardResponse(BaseModel):
+    status: UserStatusSchema
+    units: List[DashboardUnitSchema]
+
 class HeartPurchaseResponse(BaseModel):
     user_id: int
     hearts: int
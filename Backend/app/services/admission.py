@@ -0,0 +1,66 @@
+from collections import defaultdict
+from typing import Any, Dict, Hashable, Optional
+
+# try_acquire rejection reasons
+REJECT_GLOBAL = "global"
+REJECT_USER = "user"
+
+
+class AdmissionController:
+    """Bounds recognition work in flight, globally and per user.
+
+    Requests over either cap are turned away immediately instead of
+    queueing, so a burst costs the rejected callers one round trip and
+    leaves the latency of admitted requests intact. A ``None`` key is an
+    anonymous caller, bound by the global cap only: behind a proxy or NAT
+    there is no address that tells anonymous users apart.
+    """
+
+    def __init__(self, max_in_flight: int = 64, max_per_user: int = 2):
+        self.max_in_flight = max_in_flight
+        self.max_per_user = max_per_user
+        self.in_flight = 0
+        self.per_user: Dict[Hashable, int] = defaultdict(int)
+        self.anonymous_in_flight = 0
+        self.peak_in_flight = 0
+        self.admitted = 0
+        self.rejected = {REJECT_GLOBAL: 0, REJECT_USER: 0}
+
+    def try_acquire(self, key: Optional[Hashable]) -> Optional[str]:
+        """Take a slot for ``key``; returns a rejection reason or None."""
+        if key is not None and self.max_per_user > 0 and self.per_user.get(key, 0) >= self.max_per_user:
+            self.rejected[REJECT_USER] += 1
+            return REJECT_USER
+        if self.max_in_flight > 0 and self.in_flight >= self.max_in_flight:
+            self.rejected[REJECT_GLOBAL] += 1
+            return REJECT_GLOBAL
+
+        self.in_flight += 1
+        if key is None:
+            self.anonymous_in_flight += 1
+        else:
+            self.per_user[key] += 1
+        self.admitted += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        return None
+
+    def release(self, key: Optional[Hashable]):
+        self.in_flight -= 1
+        if key is None:
+            self.anonymous_in_flight -= 1
+            return
+        self.per_user[key] -= 1
+        if self.per_user[key] <= 0:
+            del self.per_user[key]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_in_flight": self.max_in_flight,
+            "max_per_user": self.max_per_user,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "active_users": len(self.per_user),
+            "anonymous_in_flight": self.anonymous_in_flight,
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected),
+        }
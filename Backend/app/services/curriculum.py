@@ -0,0 +1,254 @@
+import asyncio
+import hashlib
+import time
+from collections import defaultdict
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+from pydantic import parse_obj_as
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.config import CURRICULUM_SNAPSHOT_TTL_SECONDS
+from app.models import HeartPackage, Lesson, Sign, Unit
+from app.schemas import HeartPackage as HeartPackageSchema, LessonResponseSchema, UnitWithLessonsSchema
+from app.services.http_cache import CachedBody, json_body
+
+SIGN_DIFFICULTIES = tuple(Sign.__table__.c.difficulty_level.type.enums)
+
+
+class LessonPosition(NamedTuple):
+    unit_id: int
+    previous_lesson_id: Optional[int]  # in the same unit, archived lessons included
+    next_lesson_id: Optional[int]  # next active lesson in course order
+
+
+class CurriculumSnapshot:
+    """The unit → lesson → sign tree, and the heart packages, as the
+    learner endpoints serve them.
+
+    Built in one go from four queries and never modified afterwards:
+    sequences are tuples and lookups read-only mappings, and the dicts in
+    them are response bodies that callers must not mutate. ``bodies`` holds
+    every endpoint's JSON pre-rendered with its ETag, keyed by ``units``,
+    ``lessons``, ``lesson:<id>``, ``signs:<difficulty>`` and
+    ``heart_packages``. ``version`` hashes all of it, so it is the same in
+    every worker process.
+    """
+
+    __slots__ = (
+        "version",
+        "built_at",
+        "units",
+        "lessons",
+        "lesson_details",
+        "positions",
+        "signs_by_difficulty",
+        "heart_packages",
+        "bodies",
+    )
+
+    def __init__(self, units, lessons, signs, heart_packages=()):
+        signs_by_lesson = defaultdict(list)
+        active_signs_by_lesson = defaultdict(list)
+        signs_by_difficulty = defaultdict(list)
+        for sign in signs:
+            body = _sign_body(sign)
+            signs_by_lesson[sign.lesson_id].append(body)
+            if not sign.archived:
+                active_signs_by_lesson[sign.lesson_id].append(body)
+                signs_by_difficulty[sign.difficulty_level].append({
+                    "id": sign.id,
+                    "text": sign.text,
+                    "video_url": sign.video_url,
+                    "difficulty": sign.difficulty_level,
+                })
+
+        active_lessons = [lesson for lesson in lessons if not lesson.archived]
+        lessons_by_unit = defaultdict(list)
+        for lesson in active_lessons:
+            lessons_by_unit[lesson.unit_id].append(_lesson_body(lesson, signs_by_lesson[lesson.id]))
+
+        # /units/ lists active units that have at least one active lesson
+        self.units: Tuple[Dict[str, Any], ...] = tuple(
+            dict(_unit_body(unit), lessons=lessons_by_unit[unit.id])
+            for unit in units
+            if not unit.archived and lessons_by_unit[unit.id]
+        )
+        self.lessons: Tuple[Dict[str, Any], ...] = tuple(
+            _lesson_body(lesson, signs_by_lesson[lesson.id]) for lesson in active_lessons
+        )
+        # /lessons/{id} serves active lessons with their active signs only
+        self.lesson_details: Mapping[int, Dict[str, Any]] = MappingProxyType({
+            lesson.id: dict(
+                _lesson_body(lesson, active_signs_by_lesson[lesson.id]),
+                video_url=active_signs_by_lesson[lesson.id][0]["video_url"],
+            )
+            for lesson in active_lessons
+            if active_signs_by_lesson[lesson.id]
+        })
+        self.positions: Mapping[int, LessonPosition] = MappingProxyType(_positions(units, lessons))
+        self.signs_by_difficulty: Mapping[str, Tuple[Dict[str, Any], ...]] = MappingProxyType({
+            difficulty: tuple(entries) for difficulty, entries in signs_by_difficulty.items()
+        })
+        self.heart_packages: Tuple[Dict[str, Any], ...] = tuple(
+            {
+                "id": package.id,
+                "name": package.name,
+                "hearts_amount": package.hearts_amount,
+                "ruby_cost": package.ruby_cost,
+            }
+            for package in heart_packages
+        )
+
+        bodies = {
+            "units": json_body(parse_obj_as(List[UnitWithLessonsSchema], self.units)),
+            "lessons": json_body(parse_obj_as(List[LessonResponseSchema], self.lessons)),
+            "heart_packages": json_body(parse_obj_as(List[HeartPackageSchema], self.heart_packages)),
+        }
+        for lesson_id, lesson in self.lesson_details.items():
+            bodies[f"lesson:{lesson_id}"] = json_body(LessonResponseSchema.parse_obj(lesson))
+        for difficulty in set(SIGN_DIFFICULTIES) | set(self.signs_by_difficulty):
+            bodies[f"signs:{difficulty}"] = json_body(list(self.signs_by_difficulty.get(difficulty, ())))
+        self.bodies: Mapping[str, CachedBody] = MappingProxyType(bodies)
+
+        digest = hashlib.sha256()
+        for key in sorted(bodies):
+            digest.update(key.encode() + bodies[key].etag.encode())
+        self.version = digest.hexdigest()[:12]
+        self.built_at = time.monotonic()
+
+
+def _sign_body(sign) -> Dict[str, Any]:
+    return {
+        "id": sign.id,
+        "text": sign.text,
+        "video_url": sign.video_url,
+        "difficulty_level": sign.difficulty_level,
+        "created_at": sign.created_at,
+    }
+
+
+def _lesson_body(lesson, signs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "id": lesson.id,
+        "title": lesson.title,
+        "description": lesson.description,
+        "image_url": lesson.image_url,
+        "signs": signs,
+        "rubies_reward": lesson.rubies_reward,
+        "progress_bar": 0,
+        "video_url": None,
+    }
+
+
+def _unit_body(unit) -> Dict[str, Any]:
+    return {
+        "id": unit.id,
+        "title": unit.title,
+        "description": unit.description,
+        "order_index": unit.order_index,
+        "status": unit.status,
+        "created_at": unit.created_at,
+    }
+
+
+def _positions(units, lessons) -> Dict[int, LessonPosition]:
+    unit_order = {unit.id: index for index, unit in enumerate(units) if not unit.archived}
+    course = sorted(
+        (lesson for lesson in lessons if not lesson.archived and lesson.unit_id in unit_order),
+        key=lambda lesson: (unit_order[lesson.unit_id], lesson.order_index or 0, lesson.id),
+    )
+    next_ids = {
+        lesson.id: following.id for lesson, following in zip(course, course[1:])
+    }
+
+    lessons_by_unit = defaultdict(list)
+    for lesson in lessons:
+        lessons_by_unit[lesson.unit_id].append(lesson)
+
+    positions = {}
+    for unit_lessons in lessons_by_unit.values():
+        previous = last = None
+        for lesson in sorted(unit_lessons, key=lambda lesson: (lesson.order_index or 0, lesson.id)):
+            # The previous lesson is the last one with a lower order_index
+            if last is not None and (last.order_index or 0) != (lesson.order_index or 0):
+                previous = last
+            last = lesson
+            positions[lesson.id] = LessonPosition(
+                unit_id=lesson.unit_id,
+                previous_lesson_id=previous.id if previous else None,
+                next_lesson_id=next_ids.get(lesson.id),
+            )
+    return positions
+
+
+async def load_curriculum(db: AsyncSession) -> CurriculumSnapshot:
+    """Read the whole tree as plain rows and build a snapshot from it."""
+    units = (await db.execute(select(Unit.__table__).order_by(Unit.order_index, Unit.id))).all()
+    lessons = (await db.execute(select(Lesson.__table__).order_by(Lesson.order_index, Lesson.id))).all()
+    signs = (await db.execute(select(Sign.__table__).order_by(Sign.id))).all()
+    heart_packages = (await db.execute(select(HeartPackage.__table__).order_by(HeartPackage.id))).all()
+    return CurriculumSnapshot(units, lessons, signs, heart_packages)
+
+
+class CurriculumCache:
+    """Holds the current snapshot and swaps in a new one when content changes.
+
+    Readers get whichever snapshot is current and never see a partial one.
+    Heart packages have no admin endpoints, so edits to them made in the
+    database show up once the TTL expires.
+    A snapshot older than ``ttl_seconds`` is rebuilt by the next reader
+    (0 keeps it until ``rebuild`` is called); while that runs, other
+    readers keep getting the old one.
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0):
+        self.ttl = ttl_seconds
+        self.snapshot: Optional[CurriculumSnapshot] = None
+        self.rebuilds = 0
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _fresh(self, snapshot: Optional[CurriculumSnapshot]) -> bool:
+        if snapshot is None:
+            return False
+        return self.ttl <= 0 or time.monotonic() - snapshot.built_at < self.ttl
+
+    async def get(self, db: AsyncSession) -> CurriculumSnapshot:
+        snapshot = self.snapshot
+        if self._fresh(snapshot):
+            return snapshot
+        if snapshot is not None and self._lock is not None and self._lock.locked():
+            return snapshot
+        return await self.rebuild(db, if_stale=True)
+
+    async def rebuild(self, db: AsyncSession, if_stale: bool = False) -> CurriculumSnapshot:
+        """Load a new snapshot and make it current; call after content commits."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if if_stale and self._fresh(self.snapshot):
+                return self.snapshot
+            snapshot = await load_curriculum(db)
+            self.snapshot = snapshot
+            self.rebuilds += 1
+            return snapshot
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self.snapshot
+        return {
+            "version": snapshot.version if snapshot else None,
+            "age_seconds": round(time.monotonic() - snapshot.built_at, 1) if snapshot else None,
+            "ttl_seconds": self.ttl,
+            "rebuilds": self.rebuilds,
+            "units": len(snapshot.units) if snapshot else 0,
+            "lessons": len(snapshot.lessons) if snapshot else 0,
+        }
+
+
+curriculum_cache = CurriculumCache(ttl_seconds=CURRICULUM_SNAPSHOT_TTL_SECONDS)
+
+
+async def get_curriculum(db: AsyncSession) -> CurriculumSnapshot:
+    """The current curriculum snapshot; ``db`` is only used to (re)build it."""
+    return await curriculum_cache.get(db)
@@ -0,0 +1,62 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from typing import Dict, Any, Optional
+
+from app.models import UserProfile, UserProgress
+from app.schemas import UserStatusSchema
+from app.services.curriculum import get_curriculum
+from app.services.unit_progress import (
+    active_units,
+    lesson_progress_per_unit,
+    unit_lock_states,
+    unit_progress_summary,
+)
+
+async def get_dashboard(db: AsyncSession, user_id: int) -> Optional[Dict[str, Any]]:
+    """Everything the home page shows for a user, or None without a profile.
+
+    The profile status plus the /units/ tree, with each unit's lock state
+    and progress and each lesson's lock state and progress, the same values
+    the per-unit and per-lesson endpoints return. Four queries however big
+    the course is; the tree itself comes from the curriculum snapshot.
+    """
+    profile = (await db.execute(
+        select(UserProfile).where(UserProfile.user_id == user_id)
+    )).scalars().first()
+    if not profile:
+        return None
+
+    snapshot = await get_curriculum(db)
+    counts = await lesson_progress_per_unit(db, user_id)
+    locks = {state["unit_id"]: state for state in unit_lock_states(await active_units(db), counts)}
+    progress = {
+        row.lesson_id: row
+        for row in await db.execute(
+            select(UserProgress.lesson_id, UserProgress.progress, UserProgress.completed)
+            .where(UserProgress.user_id == user_id)
+        )
+    }
+
+    units = []
+    for unit in snapshot.units:
+        lock = locks.get(unit["id"], {"is_locked": False})
+        lessons = []
+        for lesson in unit["lessons"]:
+            # The first lesson of a unit is always open; the rest need the one before
+            previous = snapshot.positions[lesson["id"]].previous_lesson_id
+            own = progress.get(lesson["id"])
+            lessons.append(dict(
+                lesson,
+                is_locked=previous is not None and not (previous in progress and progress[previous].completed),
+                progress=(own.progress or 0) if own else 0,
+                completed=bool(own and own.completed),
+            ))
+        units.append(dict(
+            unit,
+            is_locked=lock["is_locked"],
+            reason=lock.get("reason"),
+            progress=unit_progress_summary(counts.get(unit["id"])),
+            lessons=lessons,
+        ))
+
+    return {"status": UserStatusSchema.from_orm(profile), "units": units}
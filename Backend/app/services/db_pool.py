@@ -0,0 +1,87 @@
+import time
+from typing import Any, Dict
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.services.metrics import Histogram
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """The async engine's queue pool, counting how requests use connections.
+
+    ``wait_ms`` is the time spent getting a connection from the pool,
+    including opening a new one. Checkouts past ``pool_size`` are overflow
+    events, and checkouts that give up after ``pool_timeout`` are timeouts.
+    A pool that keeps overflowing or timing out is too small for the
+    traffic; one whose ``held_ms`` grows has handlers sitting on
+    connections.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_ms = Histogram([1, 5, 10, 50, 100, 500, 1000, 5000])
+        self.held_ms = Histogram([5, 10, 50, 100, 500, 1000, 5000, 30000])
+        self.checkouts = 0
+        self.overflow_events = 0
+        self.timeouts = 0
+        self.peak_checked_out = 0
+
+    def _inc_overflow(self):
+        # QueuePool takes an overflow slot here before opening a connection
+        # past pool_size; counting it here, not around _do_get, keeps
+        # concurrent checkouts from counting each other's overflow
+        opened = super()._inc_overflow()
+        if opened and self._overflow > 0:
+            self.overflow_events += 1
+        return opened
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError as e:
+            if not getattr(e, "pool_counted", False):
+                e.pool_counted = True
+                self.timeouts += 1
+                self.wait_ms.observe((time.perf_counter() - start) * 1000)
+            raise
+        if "checked_out_at" in connection.info:
+            # Already counted by the retry QueuePool makes when it loses a race
+            return connection
+        now = time.perf_counter()
+        self.wait_ms.observe((now - start) * 1000)
+        connection.info["checked_out_at"] = now
+        self.checkouts += 1
+        self.peak_checked_out = max(self.peak_checked_out, self.checkedout())
+        return connection
+
+    def _do_return_conn(self, record):
+        started = record.info.pop("checked_out_at", None)
+        if started is not None:
+            self.held_ms.observe((time.perf_counter() - started) * 1000)
+        super()._do_return_conn(record)
+
+    def recreate(self):
+        # Pools are recreated on invalidation or dispose; keep the counters
+        pool = super().recreate()
+        pool.wait_ms, pool.held_ms = self.wait_ms, self.held_ms
+        pool.checkouts, pool.overflow_events = self.checkouts, self.overflow_events
+        pool.timeouts, pool.peak_checked_out = self.timeouts, self.peak_checked_out
+        return pool
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pool_size": self.size(),
+            "max_overflow": self._max_overflow,
+            "timeout_seconds": self._timeout,
+            "checked_out": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(0, self.overflow()),
+            "peak_checked_out": self.peak_checked_out,
+            "checkouts": self.checkouts,
+            "overflow_events": self.overflow_events,
+            "timeouts": self.timeouts,
+            "wait_ms": self.wait_ms.snapshot(),
+            "held_ms": self.held_ms.snapshot(),
+        }
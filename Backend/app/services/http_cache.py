@@ -0,0 +1,42 @@
+import hashlib
+from typing import Any, NamedTuple, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+
+class CachedBody(NamedTuple):
+    """A JSON response body rendered once, with a strong ETag of its bytes."""
+
+    body: bytes
+    etag: str
+
+
+def json_body(content: Any) -> CachedBody:
+    """Render ``content`` exactly as FastAPI's default JSONResponse would."""
+    body = JSONResponse(jsonable_encoder(content)).body
+    return CachedBody(body, '"' + hashlib.sha256(body).hexdigest()[:32] + '"')
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison, so a W/ prefix still matches."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def conditional_response(request: Request, cached: CachedBody, cache_control: str) -> Response:
+    """304 if the client already has this body, else the pre-rendered body."""
+    headers = {"ETag": cached.etag, "Cache-Control": cache_control}
+    if etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
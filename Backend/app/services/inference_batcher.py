@@ -0,0 +1,110 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+import numpy as np
+
+from app.services.metrics import Histogram
+
+
+class InferenceBatcher:
+    """Collects concurrent single-frame requests into one model call.
+
+    A batch is dispatched as soon as ``max_batch_size`` frames are queued or
+    ``max_wait_ms`` has passed since the oldest queued frame arrived. At most
+    ``max_concurrent_batches`` batches run at once; while they are busy new
+    frames keep accumulating into the next batch.
+    """
+
+    def __init__(
+        self,
+        predict_fn: Callable[[List[np.ndarray]], Awaitable[np.ndarray]],
+        max_batch_size: int = 16,
+        max_wait_ms: float = 10.0,
+        max_concurrent_batches: int = 1,
+    ):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.max_concurrent_batches = max(1, max_concurrent_batches)
+        self.queue: Optional[asyncio.Queue] = None
+        self.slots: Optional[asyncio.Semaphore] = None
+        self.worker: Optional[asyncio.Task] = None
+        self.inflight: Set[asyncio.Task] = set()
+        self.batch_sizes = Histogram([1, 2, 4, 8, 16, 32, 64])
+        self.queue_wait_ms = Histogram([1, 2, 5, 10, 25, 50, 100, 250, 500, 1000])
+
+    def _ensure_worker(self):
+        if self.queue is None:
+            self.queue = asyncio.Queue()
+            self.slots = asyncio.Semaphore(self.max_concurrent_batches)
+        if self.worker is None or self.worker.done():
+            self.worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, image: np.ndarray) -> np.ndarray:
+        """Queue one preprocessed frame and wait for its own prediction row."""
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((image, future, time.perf_counter()))
+        return await future
+
+    async def _collect(self) -> List[tuple]:
+        items = [await self.queue.get()]
+        deadline = items[0][2] + self.max_wait
+        while len(items) < self.max_batch_size:
+            if not self.queue.empty():
+                items.append(self.queue.get_nowait())
+                continue
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                items.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return items
+
+    async def _run(self):
+        while True:
+            await self.slots.acquire()
+            items = await self._collect()
+            # Callers that gave up (client disconnects) do not need a slot.
+            items = [item for item in items if not item[1].done()]
+            if not items:
+                self.slots.release()
+                continue
+
+            dispatched = time.perf_counter()
+            self.batch_sizes.observe(len(items))
+            for _, _, enqueued in items:
+                self.queue_wait_ms.observe((dispatched - enqueued) * 1000)
+
+            task = asyncio.get_running_loop().create_task(self._dispatch(items))
+            self.inflight.add(task)
+            task.add_done_callback(self.inflight.discard)
+
+    async def _dispatch(self, items: List[tuple]):
+        try:
+            predictions = await self.predict_fn([image for image, _, _ in items])
+        except Exception as e:
+            for _, future, _ in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self.slots.release()
+
+        for (_, future, _), prediction in zip(items, predictions):
+            if not future.done():
+                future.set_result(prediction)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "max_concurrent_batches": self.max_concurrent_batches,
+            "queue_depth": self.queue.qsize() if self.queue else 0,
+            "inflight_batches": len(self.inflight),
+            "batch_size": self.batch_sizes.snapshot(),
+            "queue_wait_ms": self.queue_wait_ms.snapshot(),
+        }
@@ -0,0 +1,133 @@
+import threading
+from typing import Dict, Type
+
+import numpy as np
+
+
+class ModelBackend:
+    """Runs a float32 ``(n, h, w, 3)`` batch through a recognition model.
+
+    ``load`` and ``predict`` block and are called from the inference
+    executor, possibly from several threads at once.
+    """
+
+    name = "base"
+
+    def __init__(self, path: str, num_threads: int = 0):
+        self.path = path
+        self.num_threads = num_threads
+
+    def load(self):
+        raise NotImplementedError
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+
+class KerasBackend(ModelBackend):
+    """The original ``models/model.h5`` Keras model."""
+
+    name = "keras"
+
+    def load(self):
+        import tensorflow as tf
+
+        if self.num_threads:
+            tf.config.threading.set_intra_op_parallelism_threads(self.num_threads)
+        self.model = tf.keras.models.load_model(self.path)
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        # predict_on_batch skips the data-adapter setup that model.predict
+        # pays on every call, which dominates at small batch sizes.
+        return np.asarray(self.model.predict_on_batch(batch))
+
+
+class TFLiteBackend(ModelBackend):
+    """A converted ``.tflite`` model, float32, float16 or int8 quantized.
+
+    Interpreters are not thread-safe, so each inference thread gets its own.
+    They are built from the file path, which TFLite memory-maps read-only,
+    so all of them (and all worker processes) share one copy of the weights.
+    """
+
+    name = "tflite"
+
+    def load(self):
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+            Interpreter = tf.lite.Interpreter
+
+        self._interpreter_cls = Interpreter
+        self._local = threading.local()
+        self._interpreter()
+
+    def _interpreter(self):
+        interpreter = getattr(self._local, "interpreter", None)
+        if interpreter is None:
+            interpreter = self._interpreter_cls(
+                model_path=self.path,
+                num_threads=self.num_threads or None,
+            )
+            interpreter.allocate_tensors()
+            self._local.interpreter = interpreter
+            self._local.batch_size = None
+        return interpreter
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        interpreter = self._interpreter()
+        input_detail = interpreter.get_input_details()[0]
+        if self._local.batch_size != len(batch):
+            interpreter.resize_tensor_input(
+                input_detail["index"], [len(batch), *batch.shape[1:]]
+            )
+            interpreter.allocate_tensors()
+            self._local.batch_size = len(batch)
+            input_detail = interpreter.get_input_details()[0]
+        output_detail = interpreter.get_output_details()[0]
+
+        if input_detail["dtype"] != np.float32:
+            scale, zero_point = input_detail["quantization"]
+            batch = np.round(batch / scale + zero_point).astype(input_detail["dtype"])
+        interpreter.set_tensor(input_detail["index"], batch)
+        interpreter.invoke()
+
+        output = interpreter.get_tensor(output_detail["index"])
+        if output_detail["dtype"] != np.float32:
+            scale, zero_point = output_detail["quantization"]
+            return (output.astype(np.float32) - zero_point) * scale
+        return output.copy()
+
+
+class OnnxBackend(ModelBackend):
+    """An exported ``.onnx`` model on the ONNX Runtime CPU provider."""
+
+    name = "onnx"
+
+    def load(self):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        if self.num_threads:
+            options.intra_op_num_threads = self.num_threads
+        self.session = ort.InferenceSession(
+            self.path, options, providers=["CPUExecutionProvider"]
+        )
+        self.input_name = self.session.get_inputs()[0].name
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        return self.session.run(None, {self.input_name: batch})[0]
+
+
+BACKENDS: Dict[str, Type[ModelBackend]] = {
+    backend.name: backend for backend in (KerasBackend, TFLiteBackend, OnnxBackend)
+}
+
+
+def create_backend(name: str, path: str, num_threads: int = 0) -> ModelBackend:
+    if name not in BACKENDS:
+        raise ValueError(
+            f"Unknown recognition backend '{name}', expected one of: {', '.join(BACKENDS)}"
+        )
+    return BACKENDS[name](path, num_threads)
@@ -0,0 +1,378 @@
+import asyncio
+import hashlib
+import json
+import random
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.config import (
+    RECOGNITION_THREADS,
+    RECOGNITION_WARMUP_RUNS,
+    INFERENCE_MAX_BATCH_SIZE,
+    INFERENCE_MAX_WAIT_MS,
+    INFERENCE_CONCURRENT_BATCHES,
+    RECOGNITION_POOL_PIN_CPUS,
+    RECOGNITION_POOL_ACQUIRE_TIMEOUT_SECONDS,
+)
+from app.services.inference_batcher import InferenceBatcher
+from app.services.metrics import Histogram
+from app.services.model_backends import create_backend
+from app.services.preprocessing import BatchBuffer, decode_frame, raw_frame
+from app.services.recognition_pool import RecognitionWorkerPool
+
+# ASL alphabet A-Z, the labels of models that ship without a manifest
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+INPUT_SIZE = (224, 224)
+
+
+def file_version(path: str) -> str:
+    """Content-derived version id for a model file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+def read_manifest(path: str) -> Tuple[List[str], Tuple[int, int]]:
+    """Labels and input size from ``<model>.labels.json`` next to the model.
+
+    The manifest looks like ``{"labels": ["a", "b", ...], "input_size": [224, 224]}``,
+    with labels in the order of the model's output units. Models without
+    one are treated as the A-Z alphabet at 224x224.
+    """
+    manifest_path = Path(path).with_suffix(".labels.json")
+    if not manifest_path.exists():
+        return list(LETTERS), INPUT_SIZE
+    manifest = json.loads(manifest_path.read_text())
+    return list(manifest["labels"]), tuple(manifest.get("input_size", INPUT_SIZE))
+
+
+class ModelVersion:
+    """One recognition model: its weights, class labels, input size and batcher.
+
+    Each version batches separately, so frames routed to a canary are never
+    mixed into a batch for the active model.
+    """
+
+    def __init__(self, version: str, backend: str, path: str, labels: Sequence[str],
+                 input_size: Tuple[int, int], executor, pool_workers: int = 0):
+        self.version = version
+        self.backend = backend
+        self.path = path
+        self.labels = list(labels)
+        self.input_size = tuple(input_size)
+        self.raw_frame_bytes = self.input_size[0] * self.input_size[1] * 3
+        self.executor = executor
+        self.pool_workers = pool_workers
+        self.model = None
+        self.state: Dict[str, Any] = {
+            "status": "not_loaded",  # not_loaded | loading | ready | failed | retired
+            "load_time_ms": None,
+            "warmup_ms": None,
+            "warm_latency_ms": None,
+            "error": None,
+        }
+        self.batch_buffer = BatchBuffer(INFERENCE_MAX_BATCH_SIZE)
+        self.batcher = InferenceBatcher(
+            self.predict_batch,
+            max_batch_size=INFERENCE_MAX_BATCH_SIZE,
+            max_wait_ms=INFERENCE_MAX_WAIT_MS,
+            # With a worker pool, keep one batch in flight per worker process
+            max_concurrent_batches=pool_workers or INFERENCE_CONCURRENT_BATCHES,
+        )
+        self.latency_ms = Histogram([5, 10, 25, 50, 100, 250, 500, 1000])
+        self.inflight = 0
+
+    @property
+    def ready(self) -> bool:
+        return self.model is not None
+
+    @property
+    def healthy(self) -> bool:
+        """Ready to serve now: loaded and, with a pool, some worker running."""
+        if isinstance(self.model, RecognitionWorkerPool):
+            return self.model.healthy
+        return self.ready
+
+    @contextmanager
+    def serving(self):
+        """Count a request against this version, so retiring it waits for it."""
+        self.inflight += 1
+        try:
+            yield self
+        finally:
+            self.inflight -= 1
+
+    def _warm_up(self, backend) -> float:
+        """Trace the graph for the batch sizes we serve; returns the warm latency."""
+        latency_ms = 0.0
+        width, height = self.input_size
+        for batch_size in sorted({1, INFERENCE_MAX_BATCH_SIZE}):
+            dummy = np.zeros((batch_size, height, width, 3), dtype=np.float32)
+            for _ in range(max(1, RECOGNITION_WARMUP_RUNS)):
+                start = time.perf_counter()
+                backend.predict(dummy)
+                if batch_size == 1:
+                    latency_ms = (time.perf_counter() - start) * 1000
+        return latency_ms
+
+    def load(self):
+        """Load and warm up the model. Blocks; run it on the inference executor."""
+        start = time.perf_counter()
+        if self.pool_workers > 0:
+            loaded = RecognitionWorkerPool(
+                self.backend,
+                self.path,
+                workers=self.pool_workers,
+                max_batch=INFERENCE_MAX_BATCH_SIZE,
+                frame_shape=(self.input_size[1], self.input_size[0], 3),
+                threads=RECOGNITION_THREADS or 1,
+                warmup_runs=RECOGNITION_WARMUP_RUNS,
+                pin_cpus=RECOGNITION_POOL_PIN_CPUS,
+                acquire_timeout=RECOGNITION_POOL_ACQUIRE_TIMEOUT_SECONDS,
+            )
+            timings = loaded.start()
+        else:
+            loaded = create_backend(self.backend, self.path, RECOGNITION_THREADS)
+            loaded.load()
+            loaded_at = time.perf_counter()
+            warm_latency_ms = self._warm_up(loaded)
+            timings = {
+                "load_time_ms": (loaded_at - start) * 1000,
+                "warmup_ms": (time.perf_counter() - loaded_at) * 1000,
+                "warm_latency_ms": warm_latency_ms,
+            }
+        self.model = loaded
+        self.state.update(status="ready", **{key: round(value, 1) for key, value in timings.items()})
+
+    def _predict(self, frames: List[np.ndarray]) -> np.ndarray:
+        return self.model.predict(self.batch_buffer.normalize(frames))
+
+    async def predict_batch(self, frames: List[np.ndarray]) -> np.ndarray:
+        """Run uint8 frames through the worker pool or the in-process backend."""
+        if isinstance(self.model, RecognitionWorkerPool):
+            return await self.model.predict(frames)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._predict, frames)
+
+    def is_raw_frame(self, data: bytes) -> bool:
+        """Raw frames have an exact size and none of the JPEG/PNG magic bytes."""
+        if len(data) != self.raw_frame_bytes:
+            return False
+        return not (data.startswith(b"\xff\xd8") or data.startswith(b"\x89PNG"))
+
+    def prepare(self, data: bytes) -> np.ndarray:
+        """Decode a JPEG/PNG, or view a raw RGB frame, at this model's input size."""
+        if self.is_raw_frame(data):
+            return raw_frame(data, self.input_size)
+        return decode_frame(data, self.input_size)
+
+    def prepare_many(self, items: Sequence[bytes]) -> List[np.ndarray]:
+        frames = []
+        for i, data in enumerate(items):
+            try:
+                frames.append(self.prepare(data))
+            except ValueError:
+                raise ValueError(f"Could not decode frame {i}")
+        return frames
+
+    def unpack(self, body: bytes) -> List[np.ndarray]:
+        """Split a body of packed raw frames into per-frame views, without copying."""
+        if len(body) % self.raw_frame_bytes:
+            raise ValueError(f"Body must be a whole number of {self.raw_frame_bytes}-byte frames")
+        width, height = self.input_size
+        return list(np.frombuffer(body, np.uint8).reshape(-1, height, width, 3))
+
+    def label(self, index: int) -> str:
+        return self.labels[index] if 0 <= index < len(self.labels) else "unknown"
+
+    def format_prediction(self, prediction: np.ndarray) -> Dict[str, Any]:
+        """Map one row of class probabilities to the API response."""
+        predicted_class_index = int(np.argmax(prediction))
+        return {
+            "letter": self.label(predicted_class_index),
+            "confidence": float(prediction[predicted_class_index]),
+        }
+
+    def shutdown(self):
+        """Stop recognition worker processes, if any."""
+        if isinstance(self.model, RecognitionWorkerPool):
+            self.model.shutdown()
+        self.model = None
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "backend": self.backend,
+            "path": self.path,
+            "labels": len(self.labels),
+            "input_size": list(self.input_size),
+            "pool_workers": self.pool_workers,
+            "inflight": self.inflight,
+            **self.state,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.batcher.stats(),
+            "latency_ms": self.latency_ms.snapshot(),
+            "pool": self.model.stats() if isinstance(self.model, RecognitionWorkerPool) else None,
+        }
+
+
+class ModelRegistry:
+    """Loaded model versions, the active one and an optional canary.
+
+    Swapping the active version is a single reference assignment, so every
+    request runs start to finish on the version it was routed to. A version
+    taken out of service is only shut down once its in-flight requests have
+    drained.
+    """
+
+    def __init__(self, executor):
+        self.executor = executor
+        self.versions: Dict[str, ModelVersion] = {}
+        self.active: Optional[ModelVersion] = None
+        self.candidate: Optional[ModelVersion] = None
+        self.canary_percent = 0.0
+        self.error: Optional[str] = None
+        self.tasks = set()
+
+    def status(self) -> str:
+        if self.active is not None:
+            return "ready"
+        states = {version.state["status"] for version in self.versions.values()}
+        if "loading" in states:
+            return "loading"
+        if self.error or "failed" in states:
+            return "failed"
+        return "not_loaded"
+
+    def route(self) -> Optional[ModelVersion]:
+        """The version to serve the next request: the canary for
+        ``canary_percent`` of traffic, otherwise the active one."""
+        candidate = self.candidate
+        if candidate is not None and candidate.healthy and random.random() * 100 < self.canary_percent:
+            return candidate
+        return self.active
+
+    def get(self, version: str) -> ModelVersion:
+        if version not in self.versions:
+            raise KeyError(f"Unknown model version '{version}'")
+        return self.versions[version]
+
+    async def register(self, backend: str, path: str, version: Optional[str] = None,
+                       labels: Optional[Sequence[str]] = None,
+                       input_size: Optional[Tuple[int, int]] = None,
+                       pool_workers: int = 0) -> ModelVersion:
+        """Describe a model file as a new, not yet loaded, version.
+
+        Labels and input size default to the model's manifest. A version
+        that failed to load can be registered again. Raises ValueError if
+        the version id is otherwise taken and OSError if the file is
+        unreadable.
+        """
+        loop = asyncio.get_running_loop()
+        if not version:
+            version = await loop.run_in_executor(self.executor, file_version, path)
+        existing = self.versions.get(version)
+        if existing is not None and existing.state["status"] != "failed":
+            raise ValueError(f"Model version '{version}' is already registered")
+        manifest_labels, manifest_size = await loop.run_in_executor(self.executor, read_manifest, path)
+        model_version = ModelVersion(
+            version, backend, path,
+            labels or manifest_labels,
+            input_size or manifest_size,
+            self.executor,
+            pool_workers=pool_workers,
+        )
+        self.versions[version] = model_version
+        return model_version
+
+    async def load(self, model_version: ModelVersion, activate: bool = False) -> bool:
+        """Load and warm up a registered version, optionally making it active."""
+        loop = asyncio.get_running_loop()
+        model_version.state.update(status="loading", error=None)
+        try:
+            await loop.run_in_executor(self.executor, model_version.load)
+        except Exception as e:
+            print(f"❌ Failed to load ASL Recognition model {model_version.version}: {e}")
+            model_version.state.update(status="failed", error=str(e))
+            return False
+        print(f"✅ ASL Recognition model {model_version.version} ({model_version.backend}) loaded successfully!")
+        if activate:
+            self.activate(model_version.version)
+        return True
+
+    def load_in_background(self, model_version: ModelVersion, activate: bool = False):
+        model_version.state.update(status="loading", error=None)
+        task = asyncio.get_running_loop().create_task(self.load(model_version, activate))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    def activate(self, version: str) -> Optional[ModelVersion]:
+        """Atomically make a ready version active; returns the previous one."""
+        model_version = self.get(version)
+        if not model_version.ready:
+            raise ValueError(f"Model version '{version}' is {model_version.state['status']}")
+        previous, self.active = self.active, model_version
+        if self.candidate is model_version:
+            self.candidate, self.canary_percent = None, 0.0
+        self.error = None
+        return previous if previous is not model_version else None
+
+    def set_canary(self, version: Optional[str], percent: float):
+        """Send ``percent`` of traffic to ``version``; None or 0 clears it."""
+        if not version or percent <= 0:
+            self.candidate, self.canary_percent = None, 0.0
+            return
+        model_version = self.get(version)
+        if not model_version.ready:
+            raise ValueError(f"Model version '{version}' is {model_version.state['status']}")
+        if model_version is self.active:
+            raise ValueError(f"Model version '{version}' is already active")
+        self.candidate, self.canary_percent = model_version, min(float(percent), 100.0)
+
+    async def retire(self, model_version: ModelVersion):
+        """Unregister a version and shut it down once its requests drain."""
+        if model_version is self.active:
+            raise ValueError(f"Model version '{model_version.version}' is active")
+        if model_version.state["status"] == "loading":
+            raise ValueError(f"Model version '{model_version.version}' is still loading")
+        if model_version is self.candidate:
+            self.candidate, self.canary_percent = None, 0.0
+        self.versions.pop(model_version.version, None)
+        while model_version.inflight:
+            await asyncio.sleep(0.05)
+        worker = model_version.batcher.worker
+        if worker is not None:
+            worker.cancel()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.executor, model_version.shutdown)
+        model_version.state["status"] = "retired"
+
+    def retire_in_background(self, model_version: ModelVersion):
+        task = asyncio.get_running_loop().create_task(self.retire(model_version))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    def shutdown(self):
+        for model_version in self.versions.values():
+            model_version.shutdown()
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "status": self.status(),
+            "active": self.active.version if self.active else None,
+            "candidate": self.candidate.version if self.candidate else None,
+            "canary_percent": self.canary_percent,
+            "error": self.error,
+            "versions": [model_version.info() for model_version in self.versions.values()],
+        }
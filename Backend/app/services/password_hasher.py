@@ -0,0 +1,90 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from app.services.metrics import Histogram
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when more password jobs are pending than the hasher accepts."""
+
+
+class PasswordHasher:
+    """Runs bcrypt on its own thread pool so it never blocks the event loop.
+
+    bcrypt releases the GIL while hashing, so ``workers`` threads use up to
+    that many cores. At most ``max_pending`` jobs may be queued or running;
+    past that, callers are turned away immediately instead of stacking up
+    seconds of queued CPU work during a login storm.
+    """
+
+    def __init__(self, context, workers: int = 2, max_pending: int = 64):
+        self.context = context
+        self.workers = max(1, workers)
+        self.max_pending = max_pending
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        self.pending = 0
+        self.rejected = 0
+        self._pending_lock = threading.Lock()
+        self.cost_ms: Optional[float] = None
+        self.wait_ms = Histogram([1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500])
+        self.run_ms = {
+            "hash": Histogram([25, 50, 100, 200, 400, 800, 1600]),
+            "verify": Histogram([25, 50, 100, 200, 400, 800, 1600]),
+        }
+
+    def _timed(self, kind: str, fn, args, enqueued: float):
+        started = time.perf_counter()
+        self.wait_ms.observe((started - enqueued) * 1000)
+        try:
+            return fn(*args)
+        finally:
+            self.run_ms[kind].observe((time.perf_counter() - started) * 1000)
+
+    def _finished(self, future):
+        with self._pending_lock:
+            self.pending -= 1
+
+    async def _run(self, kind: str, fn, *args):
+        with self._pending_lock:
+            if self.max_pending > 0 and self.pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordHasherBusy(f"{self.pending} password jobs pending")
+            self.pending += 1
+        # A job stays pending until the pool is done with it, not until its
+        # caller stops waiting: a cancelled request's hash keeps running.
+        future = self.executor.submit(self._timed, kind, fn, args, time.perf_counter())
+        future.add_done_callback(self._finished)
+        return await asyncio.wrap_future(future)
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", self.context.hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run("verify", self.context.verify, plain_password, hashed_password)
+
+    def measure_cost(self) -> float:
+        """Time one hash at the configured cost factor; blocks for about twice that.
+
+        The first hash also loads the bcrypt backend, so it is not timed.
+        """
+        self.context.hash("cost-factor-probe")
+        start = time.perf_counter()
+        self.context.hash("cost-factor-probe")
+        self.cost_ms = (time.perf_counter() - start) * 1000
+        return self.cost_ms
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rounds": self.context.handler().default_rounds,
+            "cost_ms": round(self.cost_ms, 1) if self.cost_ms is not None else None,
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "rejected": self.rejected,
+            "wait_ms": self.wait_ms.snapshot(),
+            "hash_ms": self.run_ms["hash"].snapshot(),
+            "verify_ms": self.run_ms["verify"].snapshot(),
+        }
@@ -1,95 +1,33 @@
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import joinedload
 from app.models import (
-    Sign,
     UserProfile,
     UserPracticeProgress,
     PracticeLevel,
-    PracticeGame,
-    Lesson,
-    Unit,
-    UserProgress
+    PracticeGame
 )
+from app.services.unit_progress import get_overall_progress
 from typing import List, Dict, Any
 
-async def get_practice_signs(db: AsyncSession, user_id: int, difficulty: str) -> List[Dict[str, Any]]:
-    try:
-        valid_difficulties = ["beginner", "intermediate", "advanced"]
-        if difficulty not in valid_difficulties:
-            difficulty = "beginner"
-        
-        result = await db.execute(
-            select(Sign).where(
-                Sign.difficulty_level == difficulty,
-                Sign.archived == False
-            )
-        )
-        signs = result.scalars().all()
-        
-        return [
-            {
-                "id": sign.id,
-                "text": sign.text,
-                "video_url": sign.video_url,
-                "difficulty": sign.difficulty_level
-            }
-            for sign in signs
-        ]
-    
-    except Exception as e:
-        raise
+def practice_difficulty(difficulty: str) -> str:
+    """Unknown difficulty levels fall back to beginner."""
+    valid_difficulties = ["beginner", "intermediate", "advanced"]
+    if difficulty not in valid_difficulties:
+        return "beginner"
+    return difficulty
 
 async def get_practice_levels(db: AsyncSession, user_id: int) -> List[Dict[str, Any]]:
     try:
         levels_result = await db.execute(
-            select(PracticeLevel).order_by(PracticeLevel.order_index)
+            select(PracticeLevel)
+            .options(joinedload(PracticeLevel.games))
+            .order_by(PracticeLevel.order_index)
         )
-        levels = levels_result.scalars().all()
+        levels = levels_result.unique().scalars().all()
         
-        profile_result = await db.execute(
-            select(UserProfile).where(UserProfile.user_id == user_id)
-        )
-        profile = profile_result.scalars().first()
-        
-        overall_progress = 0
-        try:
-            units_result = await db.execute(
-                select(Unit).where(Unit.archived == False)
-            )
-            units = units_result.scalars().all()
-            
-            if units:
-                total_unit_progress = 0
-                
-                for unit in units:
-                    lessons_result = await db.execute(
-                        select(Lesson)
-                        .where(Lesson.unit_id == unit.id, Lesson.archived == False)
-                    )
-                    lessons = lessons_result.scalars().all()
-                    
-                    if not lessons:
-                        continue
-                    
-                    unit_total = 0
-                    for lesson in lessons:
-                        prog_result = await db.execute(
-                            select(UserProgress)
-                            .where(
-                                UserProgress.user_id == user_id,
-                                UserProgress.lesson_id == lesson.id
-                            )
-                        )
-                        prog = prog_result.scalars().first()
-                        if prog:
-                            unit_total += prog.progress
-                    
-                    unit_progress = unit_total / len(lessons) if lessons else 0
-                    total_unit_progress += unit_progress
-                
-                overall_progress = round(total_unit_progress / len(units)) if units else 0
-        except Exception as e:
-            pass
+        overall_progress = await get_overall_progress(db, user_id)
         
         user_progress_result = await db.execute(
             select(UserPracticeProgress)
@@ -182,14 +120,12 @@ async def update_progress(
             elif "advanced" in name_lower:
                 difficulty_multiplier = 3
 
-        progress_result = await db.execute(
-            select(UserPracticeProgress).where(
-                UserPracticeProgress.user_id == user_id,
-                UserPracticeProgress.level_id == level_id,
-                UserPracticeProgress.game_id == game.id
-            )
+        progress_query = select(UserPracticeProgress).where(
+            UserPracticeProgress.user_id == user_id,
+            UserPracticeProgress.level_id == level_id,
+            UserPracticeProgress.game_id == game.id
         )
-        user_progress = progress_result.scalars().first()
+        user_progress = (await db.execute(progress_query)).scalars().first()
         if not user_progress:
             user_progress = UserPracticeProgress(
                 user_id=user_id,
@@ -200,6 +136,12 @@ async def update_progress(
                 completed=False
             )
             db.add(user_progress)
+            try:
+                await db.flush()
+            except IntegrityError:
+                # A concurrent first score created it; uq_user_practice_progress_user_level_game kept it single
+                await db.rollback()
+                user_progress = (await db.execute(progress_query)).scalars().one()
 
         progress_pct = min(100, score)
         user_progress.progress = max(user_progress.progress, progress_pct)
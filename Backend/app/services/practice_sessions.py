@@ -0,0 +1,180 @@
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional
+
+from sqlalchemy import func, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.config import PRACTICE_SESSION_MAX, PRACTICE_SESSION_TTL_SECONDS
+from app.models import Lesson, UserProgress, UserProfile
+
+
+class PracticeSession:
+    """One learner working through one lesson's signs in order."""
+
+    def __init__(self, user_id: int, lesson_id: int, signs: List[str],
+                 index: int, rubies_reward: int, completed: bool):
+        self.user_id = user_id
+        self.lesson_id = lesson_id
+        self.signs = signs
+        self.index = index
+        self.rubies_reward = rubies_reward
+        self.completed = completed
+
+    @property
+    def expected(self) -> Optional[str]:
+        """The sign to perform next, or None once every sign is done."""
+        if self.index >= len(self.signs):
+            return None
+        return self.signs[self.index]
+
+    @property
+    def progress(self) -> int:
+        if not self.signs:
+            return 0
+        return int((self.index / len(self.signs)) * 100)
+
+
+class PracticeSessionStore:
+    """In-memory sessions keyed by (user_id, lesson_id), LRU and idle-TTL bounded.
+
+    A session only caches what the database already holds, so dropping one
+    (eviction, expiry, restart, another worker) just costs a reload.
+    """
+
+    def __init__(self, max_sessions: int = 10000, ttl_seconds: float = 900.0):
+        self.max_sessions = max_sessions
+        self.ttl = ttl_seconds
+        self.sessions: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.loads = 0
+
+    def get(self, user_id: int, lesson_id: int) -> Optional[PracticeSession]:
+        key = (user_id, lesson_id)
+        entry = self.sessions.get(key)
+        if entry is None:
+            return None
+        last_used, session = entry
+        now = time.monotonic()
+        if now - last_used > self.ttl:
+            del self.sessions[key]
+            return None
+        self.sessions[key] = (now, session)
+        self.sessions.move_to_end(key)
+        self.hits += 1
+        return session
+
+    def put(self, session: PracticeSession):
+        key = (session.user_id, session.lesson_id)
+        self.sessions[key] = (time.monotonic(), session)
+        self.sessions.move_to_end(key)
+        self.loads += 1
+        while len(self.sessions) > self.max_sessions:
+            self.sessions.popitem(last=False)
+
+    def end(self, user_id: int, lesson_id: int) -> Optional[PracticeSession]:
+        entry = self.sessions.pop((user_id, lesson_id), None)
+        return entry[1] if entry else None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "sessions": len(self.sessions),
+            "max_sessions": self.max_sessions,
+            "hits": self.hits,
+            "loads": self.loads,
+        }
+
+
+session_store = PracticeSessionStore(
+    max_sessions=PRACTICE_SESSION_MAX,
+    ttl_seconds=PRACTICE_SESSION_TTL_SECONDS,
+)
+
+
+async def load_practice_session(db: AsyncSession, user_id: int, lesson_id: int) -> Optional[PracticeSession]:
+    """Build a session from the lesson and the user's progress row.
+
+    Creates the progress row on first practice, like the frame check used
+    to. Returns None if the lesson does not exist.
+    """
+    result = await db.execute(select(Lesson).where(Lesson.id == lesson_id))
+    lesson = result.scalars().first()
+    if not lesson:
+        return None
+    signs = [sign.text for sign in lesson.signs]
+    rubies_reward = lesson.rubies_reward or 0
+
+    result = await db.execute(
+        select(UserProgress).where(
+            UserProgress.user_id == user_id,
+            UserProgress.lesson_id == lesson_id
+        )
+    )
+    user_progress = result.scalars().first()
+    if not user_progress:
+        user_progress = UserProgress(
+            user_id=user_id,
+            lesson_id=lesson_id,
+            progress=0,
+            completed=False,
+            last_question=0
+        )
+        db.add(user_progress)
+        try:
+            await db.commit()
+        except IntegrityError:
+            # A concurrent first frame created it; uq_user_progress_user_lesson kept it single
+            await db.rollback()
+            result = await db.execute(
+                select(UserProgress).where(
+                    UserProgress.user_id == user_id,
+                    UserProgress.lesson_id == lesson_id
+                )
+            )
+            user_progress = result.scalars().one()
+
+    return PracticeSession(
+        user_id=user_id,
+        lesson_id=lesson_id,
+        signs=signs,
+        index=user_progress.last_question or 0,
+        rubies_reward=rubies_reward,
+        completed=bool(user_progress.completed),
+    )
+
+
+async def save_practice_progress(db: AsyncSession, session: PracticeSession):
+    """Write the session's position back after it advances.
+
+    The update only ever moves ``last_question`` forward, so concurrent
+    frames that commit out of order cannot rewind it, and the lesson reward
+    is paid by whichever write flips ``completed``.
+    """
+    finished = session.expected is None
+    values = {"last_question": session.index, "progress": session.progress}
+    if finished:
+        values["completed"] = True
+
+    result = await db.execute(
+        update(UserProgress)
+        .where(
+            UserProgress.user_id == session.user_id,
+            UserProgress.lesson_id == session.lesson_id,
+            func.coalesce(UserProgress.last_question, 0) < session.index
+        )
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
+    if finished and not session.completed:
+        session.completed = True
+        if result.rowcount and session.rubies_reward:
+            await db.execute(
+                update(UserProfile)
+                .where(UserProfile.user_id == session.user_id)
+                .values(rubies=UserProfile.rubies + session.rubies_reward)
+                .execution_options(synchronize_session=False)
+            )
+    await db.commit()
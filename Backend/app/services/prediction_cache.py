@@ -0,0 +1,114 @@
+import hashlib
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+import cv2
+import numpy as np
+
+
+def bytes_key(data: bytes) -> bytes:
+    """Exact key for a request body, cheap enough to check before decoding."""
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def image_key(img: np.ndarray, mode: str = "exact") -> bytes:
+    """Key for a decoded, resized uint8 frame.
+
+    ``exact`` hashes the pixels. ``perceptual`` is a 256-bit difference hash,
+    so re-encoded or slightly noisy copies of a still hand share a key.
+    """
+    if mode == "perceptual":
+        gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
+        small = cv2.resize(gray, (17, 16), interpolation=cv2.INTER_AREA)
+        return np.packbits(small[:, 1:] > small[:, :-1]).tobytes()
+    return hashlib.blake2b(np.ascontiguousarray(img).data, digest_size=16).digest()
+
+
+def _entry_size(key: Hashable, value: Dict[str, Any]) -> int:
+    size = sys.getsizeof(key) + sys.getsizeof(value)
+    if isinstance(key, tuple):
+        size += sum(sys.getsizeof(part) for part in key)
+    for k, v in value.items():
+        size += sys.getsizeof(k) + sys.getsizeof(v)
+    return size
+
+
+class PredictionCache:
+    """LRU cache of recognition results bounded by entries, bytes and age."""
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 30.0, max_bytes: int = 8 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, key: Hashable, record_miss: bool = True) -> Optional[Dict[str, Any]]:
+        """Return a live entry. Pre-checks pass ``record_miss=False`` so a
+        request that falls through to a second key is only counted once."""
+        if not self.enabled:
+            return None
+        entry = self.entries.get(key)
+        if entry is None:
+            if record_miss:
+                self.misses += 1
+            return None
+
+        expires_at, value, size = entry
+        if expires_at < time.monotonic():
+            del self.entries[key]
+            self.bytes -= size
+            self.expirations += 1
+            if record_miss:
+                self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Dict[str, Any]):
+        if not self.enabled:
+            return
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.bytes -= old[2]
+
+        size = _entry_size(key, value)
+        self.entries[key] = (time.monotonic() + self.ttl, value, size)
+        self.bytes += size
+
+        while self.entries and (len(self.entries) > self.max_entries or self.bytes > self.max_bytes):
+            _, (_, _, evicted_size) = self.entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
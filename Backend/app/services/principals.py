@@ -0,0 +1,109 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.config import AUTH_CACHE_SIZE, AUTH_CACHE_TTL_SECONDS
+from app.models import Account
+
+
+class TokenClaims(NamedTuple):
+    """What a verified access token says about its holder, no DB involved."""
+
+    user_id: int
+    role: Optional[str]
+
+
+class Principal:
+    """The account fields request handlers use, detached from any session."""
+
+    __slots__ = ("user_id", "name", "email", "role", "status")
+
+    def __init__(self, user_id: int, name: str, email: str, role: str, status: str):
+        self.user_id = user_id
+        self.name = name
+        self.email = email
+        self.role = role
+        self.status = status
+
+
+class PrincipalCache:
+    """Authenticated principals by user id, LRU and TTL bounded.
+
+    The TTL is the longest a change made outside ``invalidate`` (another
+    worker process, a manual DB edit) can go unnoticed.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self.entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl > 0
+
+    def get(self, user_id: int) -> Optional[Principal]:
+        entry = self.entries.get(user_id)
+        if entry is not None and time.monotonic() - entry[0] <= self.ttl:
+            self.entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+        if entry is not None:
+            del self.entries[user_id]
+        self.misses += 1
+        return None
+
+    def put(self, principal: Principal):
+        if not self.enabled:
+            return
+        self.entries[principal.user_id] = (time.monotonic(), principal)
+        self.entries.move_to_end(principal.user_id)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, user_id: int):
+        self.entries.pop(user_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+principal_cache = PrincipalCache(
+    max_entries=AUTH_CACHE_SIZE,
+    ttl_seconds=AUTH_CACHE_TTL_SECONDS,
+)
+
+
+async def load_principal(db: AsyncSession, user_id: int) -> Optional[Principal]:
+    """The cached principal for ``user_id``, reading the account on a miss."""
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+    result = await db.execute(
+        select(Account.user_id, Account.name, Account.email, Account.role, Account.status)
+        .where(Account.user_id == user_id)
+    )
+    row = result.first()
+    if row is None:
+        return None
+    principal = Principal(*row)
+    principal_cache.put(principal)
+    return principal
+
+
+def invalidate_principal(user_id: int):
+    """Call after committing a change to an account's name, email, role or status."""
+    principal_cache.invalidate(user_id)
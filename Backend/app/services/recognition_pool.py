@@ -0,0 +1,312 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.model_backends import create_backend
+from app.services.preprocessing import BatchBuffer
+
+# Upper bound on output units per frame; the output area is sized for it
+MAX_OUTPUTS = 1024
+# Seconds between attempts to respawn a worker that died, doubling up to the max
+RESTART_BACKOFF_SECONDS = 1.0
+RESTART_BACKOFF_MAX_SECONDS = 30.0
+
+
+class PoolUnavailableError(RuntimeError):
+    """Raised when no worker became idle in time, e.g. all are restarting."""
+
+
+def _worker_main(conn, backend_name, model_path, threads, in_name, out_name,
+                 max_batch, frame_shape, warmup_runs, cpu):
+    if cpu is not None and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {cpu})
+
+    in_shm, out_shm = SharedMemory(name=in_name), SharedMemory(name=out_name)
+    frames = np.ndarray((max_batch, *frame_shape), dtype=np.uint8, buffer=in_shm.buf)
+    outputs = np.ndarray((max_batch * MAX_OUTPUTS,), dtype=np.float32, buffer=out_shm.buf)
+    buffer = BatchBuffer(max_batch)
+
+    try:
+        start = time.perf_counter()
+        backend = create_backend(backend_name, model_path, threads)
+        backend.load()
+        loaded_at = time.perf_counter()
+        latency_ms = 0.0
+        for n in sorted({1, max_batch}):
+            for _ in range(max(1, warmup_runs)):
+                run_start = time.perf_counter()
+                backend.predict(buffer.normalize(np.zeros((n, *frame_shape), np.uint8)))
+                if n == 1:
+                    latency_ms = (time.perf_counter() - run_start) * 1000
+        conn.send(("ready", {
+            "load_time_ms": (loaded_at - start) * 1000,
+            "warmup_ms": (time.perf_counter() - loaded_at) * 1000,
+            "warm_latency_ms": latency_ms,
+        }))
+    except Exception as e:
+        conn.send(("error", str(e)))
+        return
+
+    while True:
+        n = conn.recv()
+        if n is None:
+            break
+        try:
+            probs = backend.predict(buffer.normalize(frames[:n]))
+            k = probs.shape[1]
+            outputs[:n * k] = probs.ravel()
+            conn.send(("ok", k))
+        except Exception as e:
+            conn.send(("error", str(e)))
+
+    del frames, outputs
+    in_shm.close()
+    out_shm.close()
+
+
+class _Worker:
+    def __init__(self, index: int, max_batch: int, frame_shape: Tuple[int, ...]):
+        self.index = index
+        self.in_shm = SharedMemory(create=True, size=max_batch * int(np.prod(frame_shape)))
+        self.out_shm = SharedMemory(create=True, size=max_batch * MAX_OUTPUTS * 4)
+        self.frames = np.ndarray((max_batch, *frame_shape), dtype=np.uint8, buffer=self.in_shm.buf)
+        self.outputs = np.ndarray((max_batch * MAX_OUTPUTS,), dtype=np.float32, buffer=self.out_shm.buf)
+        self.conn = None
+        self.process = None
+        self.timings = {}
+
+    def release(self):
+        del self.frames, self.outputs
+        self.in_shm.close()
+        self.in_shm.unlink()
+        self.out_shm.close()
+        self.out_shm.unlink()
+
+
+class RecognitionWorkerPool:
+    """Recognition model replicas in separate processes, one per core.
+
+    The API process copies uint8 frames into a worker's shared-memory input
+    slot and gets probabilities back through a shared output slot. Only a
+    batch size and an output width go over the pipe, so numpy arrays are
+    never pickled. Normalisation and inference run in the worker, which
+    keeps the API process light.
+
+    TFLite models are loaded from the file path, which TFLite memory-maps
+    read-only. Every worker then shares one copy of the weights through the
+    page cache.
+
+    A worker that dies is reaped and respawned in the background, retrying
+    with backoff until it loads again. While every worker is down the pool
+    is not ``healthy``, and callers waiting for a worker give up after
+    ``acquire_timeout`` seconds instead of waiting forever.
+    """
+
+    def __init__(self, backend_name: str, model_path: str, workers: int, max_batch: int,
+                 frame_shape: Tuple[int, ...], threads: int = 1, warmup_runs: int = 1,
+                 pin_cpus: bool = True, acquire_timeout: float = 30.0):
+        self.backend_name = backend_name
+        self.model_path = model_path
+        self.size = max(1, workers)
+        self.max_batch = max_batch
+        self.frame_shape = frame_shape
+        self.threads = threads
+        self.warmup_runs = warmup_runs
+        self.cpus = sorted(os.sched_getaffinity(0)) if pin_cpus and hasattr(os, "sched_getaffinity") else None
+        self.context = multiprocessing.get_context("spawn")
+        self.workers: List[_Worker] = []
+        self.idle: Optional[asyncio.Queue] = None
+        self.acquire_timeout = acquire_timeout
+        self.restarts = 0
+        self.restart_failures = 0
+        self.down = 0
+        self.closed = False
+        self.tasks = set()
+
+    @property
+    def healthy(self) -> bool:
+        """At least one worker is running, so requests will be served."""
+        return not self.closed and self.down < len(self.workers)
+
+    def _spawn(self, worker: _Worker):
+        parent_conn, child_conn = self.context.Pipe()
+        cpu = self.cpus[worker.index % len(self.cpus)] if self.cpus else None
+        worker.process = self.context.Process(
+            target=_worker_main,
+            args=(child_conn, self.backend_name, self.model_path, self.threads,
+                  worker.in_shm.name, worker.out_shm.name, self.max_batch,
+                  self.frame_shape, self.warmup_runs, cpu),
+            name=f"recognition-worker-{worker.index}",
+            daemon=True,
+        )
+        worker.process.start()
+        child_conn.close()
+        worker.conn = parent_conn
+
+    def _wait_ready(self, worker: _Worker):
+        status, value = worker.conn.recv()
+        if status != "ready":
+            worker.process.join()
+            raise RuntimeError(f"recognition worker {worker.index} failed to load: {value}")
+        worker.timings = value
+
+    def _start_worker(self, worker: _Worker):
+        """Reap the worker's old process, spawn a new one and block until its model is warm."""
+        self._reap(worker)
+        self._spawn(worker)
+        self._wait_ready(worker)
+
+    def _reap(self, worker: _Worker):
+        if worker.conn is not None:
+            worker.conn.close()
+        if worker.process is not None and worker.process.pid is not None:
+            worker.process.join(timeout=1)
+            if worker.process.is_alive():
+                worker.process.kill()
+                worker.process.join()
+
+    def start(self) -> Dict[str, float]:
+        """Start all workers in parallel; blocks until every model is warm.
+
+        Returns the slowest worker's load, warm-up and warm latency timings.
+        """
+        for index in range(self.size):
+            worker = _Worker(index, self.max_batch, self.frame_shape)
+            self.workers.append(worker)
+            self._spawn(worker)
+        try:
+            for worker in self.workers:
+                self._wait_ready(worker)
+        except Exception:
+            self.shutdown()
+            raise
+        return {
+            key: max(worker.timings[key] for worker in self.workers)
+            for key in ("load_time_ms", "warmup_ms", "warm_latency_ms")
+        }
+
+    def _idle_queue(self) -> asyncio.Queue:
+        if self.idle is None:
+            self.idle = asyncio.Queue()
+            for worker in self.workers:
+                self.idle.put_nowait(worker)
+        return self.idle
+
+    async def _recv(self, worker: _Worker):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        fd = worker.conn.fileno()
+
+        def on_readable():
+            loop.remove_reader(fd)
+            if future.done():
+                return
+            try:
+                future.set_result(worker.conn.recv())
+            except Exception as e:
+                future.set_exception(e)
+
+        loop.add_reader(fd, on_readable)
+        try:
+            return await future
+        finally:
+            loop.remove_reader(fd)
+
+    async def _restart(self, worker: _Worker):
+        self.restarts += 1
+        self.down += 1
+        print(f"❌ Recognition worker {worker.index} died, restarting")
+        loop = asyncio.get_running_loop()
+        delay = RESTART_BACKOFF_SECONDS
+        while not self.closed:
+            try:
+                await loop.run_in_executor(None, self._start_worker, worker)
+            except Exception as e:
+                if self.closed:
+                    return
+                self.restart_failures += 1
+                print(f"❌ Recognition worker {worker.index} failed to restart, retrying in {delay:g}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RESTART_BACKOFF_MAX_SECONDS)
+                continue
+            self.down -= 1
+            self._idle_queue().put_nowait(worker)
+            print(f"✅ Recognition worker {worker.index} restarted")
+            return
+
+    def _in_background(self, coro):
+        task = asyncio.get_running_loop().create_task(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def _acquire(self) -> _Worker:
+        if not self.healthy:
+            raise PoolUnavailableError("no recognition worker is running")
+        try:
+            return await asyncio.wait_for(self._idle_queue().get(), self.acquire_timeout)
+        except asyncio.TimeoutError:
+            raise PoolUnavailableError(f"no recognition worker became idle within {self.acquire_timeout:g}s")
+
+    async def predict(self, frames: List[np.ndarray]) -> np.ndarray:
+        """Run up to ``max_batch`` uint8 frames on the next idle worker."""
+        idle = self._idle_queue()
+        worker = await self._acquire()
+        n = len(frames)
+        try:
+            for i, frame in enumerate(frames):
+                worker.frames[i] = frame
+            worker.conn.send(n)
+            status, value = await self._recv(worker)
+        except (EOFError, OSError):
+            self._in_background(self._restart(worker))
+            raise RuntimeError(f"recognition worker {worker.index} exited")
+        except BaseException:
+            # Cancelled mid-batch: the reply is still in flight, so the
+            # worker cannot be handed out until it has been drained.
+            self._in_background(self._drain(worker))
+            raise
+
+        idle.put_nowait(worker)
+        if status != "ok":
+            raise RuntimeError(f"Recognition worker error: {value}")
+        return worker.outputs[:n * value].reshape(n, value).copy()
+
+    async def _drain(self, worker: _Worker):
+        try:
+            await self._recv(worker)
+        except (EOFError, OSError):
+            await self._restart(worker)
+            return
+        self._idle_queue().put_nowait(worker)
+
+    def shutdown(self):
+        self.closed = True
+        for worker in self.workers:
+            try:
+                worker.conn.send(None)
+            except (OSError, AttributeError):
+                pass
+        for worker in self.workers:
+            if worker.process is not None and worker.process.pid is not None:
+                worker.process.join(timeout=5)
+                if worker.process.is_alive():
+                    worker.process.kill()
+            worker.release()
+        self.workers = []
+
+    def stats(self):
+        return {
+            "workers": self.size,
+            "idle": self.idle.qsize() if self.idle else self.size,
+            "restarts": self.restarts,
+            "restart_failures": self.restart_failures,
+            "down": self.down,
+            "healthy": self.healthy,
+            "cpus": [self.cpus[w.index % len(self.cpus)] for w in self.workers] if self.cpus else None,
+            "warm_latency_ms": [round(w.timings.get("warm_latency_ms", 0.0), 1) for w in self.workers],
+        }
@@ -0,0 +1,161 @@
+import asyncio
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List
+
+from app.config import (
+    RECOGNITION_BACKEND,
+    RECOGNITION_MODEL_PATH,
+    RECOGNITION_MODEL_VERSION,
+    INFERENCE_MAX_BATCH_SIZE,
+    INFERENCE_WORKERS,
+    RECOGNITION_POOL_WORKERS,
+    RECOGNITION_CACHE_SIZE,
+    RECOGNITION_CACHE_TTL_SECONDS,
+    RECOGNITION_CACHE_MAX_BYTES,
+    RECOGNITION_CACHE_KEY,
+    RECOGNITION_MAX_IN_FLIGHT,
+    RECOGNITION_MAX_PER_USER,
+)
+from app.services.admission import AdmissionController
+from app.services.model_registry import ModelRegistry, ModelVersion
+from app.services.prediction_cache import PredictionCache, bytes_key, image_key
+
+_loading_task = None
+
+# Decoding and model.predict block for tens of milliseconds, so they run here
+# instead of on the event loop. TensorFlow releases the GIL inside its ops.
+inference_executor = ThreadPoolExecutor(
+    max_workers=max(1, INFERENCE_WORKERS),
+    thread_name_prefix="inference",
+)
+
+# Every loaded model version. Requests are routed to the active version, or
+# to a canary for a share of traffic; versions only appear there once they
+# have been loaded and warmed up, so requests never see a half-initialised
+# graph.
+registry = ModelRegistry(inference_executor)
+
+class ModelUnavailableError(Exception):
+    """Raised when a prediction is requested but no model is loaded."""
+
+async def run_in_inference_executor(fn, *args):
+    """Await a blocking call on the inference thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(inference_executor, fn, *args)
+
+async def load_recognition_model():
+    """Register the configured model as the first version and activate it."""
+    if registry.active is not None:
+        return True
+    try:
+        model_version = await registry.register(
+            RECOGNITION_BACKEND,
+            RECOGNITION_MODEL_PATH,
+            version=RECOGNITION_MODEL_VERSION,
+            pool_workers=RECOGNITION_POOL_WORKERS,
+        )
+    except Exception as e:
+        print(f"❌ Failed to load ASL Recognition model: {e}")
+        registry.error = str(e)
+        return False
+    return await registry.load(model_version, activate=True)
+
+def start_model_loading():
+    """Kick off loading in the background so startup is not blocked by it."""
+    global _loading_task
+    if _loading_task is None or _loading_task.done():
+        _loading_task = asyncio.get_running_loop().create_task(load_recognition_model())
+    return _loading_task
+
+def shutdown_model():
+    """Stop recognition worker processes, if any."""
+    registry.shutdown()
+
+def route_model() -> ModelVersion:
+    """The model version that serves the next request."""
+    model_version = registry.route()
+    if model_version is None:
+        raise ModelUnavailableError(f"model is {registry.status()}")
+    if not model_version.healthy:
+        raise ModelUnavailableError("recognition workers are restarting")
+    return model_version
+
+def _prepare(model_version: ModelVersion, data: bytes):
+    frame = model_version.prepare(data)
+    return image_key(frame, RECOGNITION_CACHE_KEY), frame
+
+async def recognize_many(model_version: ModelVersion, frames: List[np.ndarray]) -> np.ndarray:
+    """Class probabilities for a client-submitted burst of frames, in order.
+
+    The request is already a batch, so it skips the batcher and the cache
+    and goes straight to the model in chunks of INFERENCE_MAX_BATCH_SIZE,
+    which run concurrently when there are several workers. Call it inside
+    ``model_version.serving()``.
+    """
+    chunks = [
+        frames[i:i + INFERENCE_MAX_BATCH_SIZE]
+        for i in range(0, len(frames), INFERENCE_MAX_BATCH_SIZE)
+    ]
+    return np.concatenate(await asyncio.gather(
+        *(model_version.predict_batch(chunk) for chunk in chunks)
+    ))
+
+def vote(model_version: ModelVersion, probabilities: np.ndarray, k: int = 3) -> List[Dict[str, Any]]:
+    """Top-k letters over a burst, ranked by mean probability across frames.
+
+    ``votes`` is the share of frames whose own top letter it was.
+    """
+    mean = probabilities.mean(axis=0)
+    winners = np.argmax(probabilities, axis=1)
+    ranked = np.argsort(mean)[::-1][:k]
+    return [
+        {
+            "letter": model_version.label(index),
+            "confidence": float(mean[index]),
+            "votes": float(np.mean(winners == index)),
+        }
+        for index in ranked
+    ]
+
+# Shared by every recognition entry point. Keys include the model version so
+# a new model never serves results computed by the old one.
+prediction_cache = PredictionCache(
+    max_entries=RECOGNITION_CACHE_SIZE,
+    ttl_seconds=RECOGNITION_CACHE_TTL_SECONDS,
+    max_bytes=RECOGNITION_CACHE_MAX_BYTES,
+)
+
+# Checked by the routes before any decoding, so overload is rejected up front
+admission = AdmissionController(
+    max_in_flight=RECOGNITION_MAX_IN_FLIGHT,
+    max_per_user=RECOGNITION_MAX_PER_USER,
+)
+
+async def _recognize(model_version: ModelVersion, data: bytes) -> Dict[str, Any]:
+    version = model_version.version
+    raw_key = (version, bytes_key(data)) if prediction_cache.enabled else None
+    if raw_key is not None:
+        cached = prediction_cache.get(raw_key, record_miss=False)
+        if cached is not None:
+            return dict(cached)
+
+    frame_key, frame = await run_in_inference_executor(_prepare, model_version, data)
+    frame_key = (version, frame_key)
+    cached = prediction_cache.get(frame_key)
+    if cached is None:
+        prediction = await model_version.batcher.submit(frame)
+        cached = model_version.format_prediction(prediction)
+        prediction_cache.put(frame_key, cached)
+    if raw_key is not None:
+        prediction_cache.put(raw_key, cached)
+    return dict(cached)
+
+async def recognize(data: bytes) -> Dict[str, Any]:
+    """Run one JPEG/PNG or raw RGB frame through the routed model's batcher."""
+    start = time.perf_counter()
+    with route_model().serving() as model_version:
+        result = await _recognize(model_version, data)
+    model_version.latency_ms.observe((time.perf_counter() - start) * 1000)
+    return result
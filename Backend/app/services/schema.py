@@ -0,0 +1,67 @@
+from pathlib import Path
+from typing import Optional
+
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from alembic.script.revision import ResolutionError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+
+class SchemaOutOfDateError(RuntimeError):
+    """The database is not at the migration revision this code was written for."""
+
+
+def migration_scripts() -> ScriptDirectory:
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "migrations"))
+    return ScriptDirectory.from_config(config)
+
+
+def _current_revision(connection) -> Optional[str]:
+    return MigrationContext.configure(connection).get_current_revision()
+
+
+def _is_known(scripts: ScriptDirectory, revision: str) -> bool:
+    try:
+        return scripts.get_revision(revision) is not None
+    except ResolutionError:
+        return False
+
+
+async def check_schema_revision(engine: AsyncEngine, strict: bool = True) -> Optional[str]:
+    """Compare the database's Alembic revision with the newest migration.
+
+    This is one small query, instead of creating or reflecting every table
+    on each boot. A database behind the code raises SchemaOutOfDateError,
+    or only warns when not ``strict``; run ``alembic upgrade head``. A
+    revision this code does not know comes from a newer release that has
+    already migrated, which is expected during a rolling deploy, so that
+    only warns.
+    """
+    scripts = migration_scripts()
+    head = scripts.get_current_head()
+    async with engine.connect() as conn:
+        current = await conn.run_sync(_current_revision)
+
+    if current == head:
+        print(f"✅ Database schema at revision {head}")
+        return current
+
+    if current is None:
+        problem = (
+            "Database has no schema revision. Run `alembic upgrade head`, or "
+            "`alembic stamp 0001` first if it was created before migrations"
+        )
+    elif _is_known(scripts, current):
+        problem = f"Database schema at revision {current}, code expects {head}. Run `alembic upgrade head`"
+    else:
+        print(f"❌ Database schema at unknown revision {current}, expected {head}; assuming a newer release migrated it")
+        return current
+
+    if strict:
+        raise SchemaOutOfDateError(problem)
+    print(f"❌ {problem}")
+    return current
@@ -0,0 +1,119 @@
+from sqlalchemy import and_, case, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.models import Lesson, Unit, UserProgress
+from typing import List, Dict, Any, Optional
+
+async def lesson_progress_per_unit(db: AsyncSession, user_id: int, unit_id: Optional[int] = None) -> Dict[int, Dict[str, int]]:
+    """Per unit: active lessons, how many the user completed, and the sum
+    of their lesson progress.
+
+    One grouped query over the lessons, joined to the user's progress rows
+    through uq_user_progress_user_lesson. Units without active lessons are
+    left out; pass ``unit_id`` to aggregate just that unit.
+    """
+    query = (
+        select(
+            Lesson.unit_id,
+            func.count(Lesson.id).label("total_lessons"),
+            func.sum(case((UserProgress.completed == True, 1), else_=0)).label("completed_lessons"),
+            func.sum(func.coalesce(UserProgress.progress, 0)).label("progress_total"),
+        )
+        .outerjoin(
+            UserProgress,
+            and_(UserProgress.lesson_id == Lesson.id, UserProgress.user_id == user_id),
+        )
+        .where(Lesson.archived == False)
+        .group_by(Lesson.unit_id)
+    )
+    if unit_id is not None:
+        query = query.where(Lesson.unit_id == unit_id)
+    result = await db.execute(query)
+    return {
+        row.unit_id: {
+            "total_lessons": row.total_lessons,
+            "completed_lessons": int(row.completed_lessons or 0),
+            "progress_total": int(row.progress_total or 0),
+        }
+        for row in result
+    }
+
+def unit_progress_summary(counts: Optional[Dict[str, int]]) -> Dict[str, Any]:
+    """The UnitProgressResponse fields for one unit's counts."""
+    if not counts:
+        return {"progress_percentage": 0.0, "completed_lessons": 0, "total_lessons": 0}
+    return {
+        "progress_percentage": counts["progress_total"] / counts["total_lessons"],
+        "completed_lessons": counts["completed_lessons"],
+        "total_lessons": counts["total_lessons"],
+    }
+
+async def get_overall_progress(db: AsyncSession, user_id: int) -> int:
+    """Mean lesson progress per unit, averaged over every active unit.
+
+    Units without active lessons count as 0. One grouped query.
+    """
+    result = await db.execute(
+        select(
+            func.count(Lesson.id).label("total_lessons"),
+            func.sum(func.coalesce(UserProgress.progress, 0)).label("progress_total"),
+        )
+        .select_from(Unit)
+        .outerjoin(Lesson, and_(Lesson.unit_id == Unit.id, Lesson.archived == False))
+        .outerjoin(
+            UserProgress,
+            and_(UserProgress.lesson_id == Lesson.id, UserProgress.user_id == user_id),
+        )
+        .where(Unit.archived == False)
+        .group_by(Unit.id)
+    )
+    units = result.all()
+    if not units:
+        return 0
+    total = sum(int(row.progress_total or 0) / row.total_lessons for row in units if row.total_lessons)
+    return round(total / len(units))
+
+async def active_units(db: AsyncSession):
+    """Id and order_index of every active unit, in course order."""
+    return (await db.execute(
+        select(Unit.id, Unit.order_index)
+        .where(Unit.archived == False)
+        .order_by(Unit.order_index, Unit.id)
+    )).all()
+
+async def get_units_progress(db: AsyncSession, user_id: int) -> List[Dict[str, Any]]:
+    """Progress of every active unit, in course order, in two queries."""
+    units = await active_units(db)
+    counts = await lesson_progress_per_unit(db, user_id)
+    return [{"unit_id": unit.id, **unit_progress_summary(counts.get(unit.id))} for unit in units]
+
+async def get_unit_lock_states(db: AsyncSession, user_id: int) -> List[Dict[str, Any]]:
+    """Lock state of every active unit, in course order, in two queries."""
+    units = await active_units(db)
+    counts = await lesson_progress_per_unit(db, user_id)
+    return unit_lock_states(units, counts)
+
+def unit_lock_states(units, counts: Dict[int, Dict[str, int]]) -> List[Dict[str, Any]]:
+    """Lock states for ``active_units`` rows given ``lesson_progress_per_unit``.
+
+    A unit unlocks once every active lesson of the unit before it is
+    completed; the first unit, and any unit with none before it, is always
+    open.
+    """
+    states = []
+    previous = None
+    last = None
+    for unit in units:
+        if last is not None and last.order_index != unit.order_index:
+            previous = last
+        last = unit
+
+        state = {"unit_id": unit.id, "is_locked": False}
+        if unit.order_index != 0 and previous is not None:
+            count = counts.get(previous.id)
+            if count is None:
+                state.update(is_locked=True, reason="Previous unit has no lessons")
+            else:
+                state["is_locked"] = count["completed_lessons"] < count["total_lessons"]
+        states.append(state)
+    return states
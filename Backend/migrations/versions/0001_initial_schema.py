@@ -0,0 +1,169 @@
+"""initial schema
+
+The tables app/models.py defined when the app still ran create_all at
+startup. A database created that way already has them: mark it as
+migrated with `alembic stamp 0001` instead of upgrading it.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 09:02:59.586873
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('accounts',
+    sa.Column('user_id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('hash_password', sa.String(length=255), nullable=False),
+    sa.Column('role', sa.Enum('user', 'admin'), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+    sa.Column('last_login', sa.TIMESTAMP(), nullable=True),
+    sa.Column('status', sa.Enum('active', 'inactive'), nullable=True),
+    sa.PrimaryKeyConstraint('user_id'),
+    sa.UniqueConstraint('email')
+    )
+    op.create_table('heart_packages',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('hearts_amount', sa.Integer(), nullable=False),
+    sa.Column('ruby_cost', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_heart_packages_id'), 'heart_packages', ['id'], unique=False)
+    op.create_table('practice_levels',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('required_progress', sa.Integer(), nullable=True),
+    sa.Column('order_index', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('units',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('order_index', sa.Integer(), nullable=True),
+    sa.Column('status', sa.Enum('active', 'inactive'), nullable=True),
+    sa.Column('archived', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('title')
+    )
+    op.create_table('lessons',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('unit_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('image_url', sa.String(length=512), nullable=True),
+    sa.Column('rubies_reward', sa.Integer(), nullable=True),
+    sa.Column('order_index', sa.Integer(), nullable=True),
+    sa.Column('archived', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['unit_id'], ['units.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('practice_games',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('level_id', sa.Integer(), nullable=False),
+    sa.Column('game_identifier', sa.String(length=50), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['level_id'], ['practice_levels.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('users',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('profile_url', sa.String(length=512), nullable=True),
+    sa.Column('progress', sa.JSON(), nullable=True),
+    sa.Column('rubies', sa.Integer(), nullable=True),
+    sa.Column('hearts', sa.Integer(), nullable=True),
+    sa.Column('hearts_last_updated', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+    sa.Column('streak', sa.Integer(), nullable=True),
+    sa.Column('last_lesson_date', sa.TIMESTAMP(), nullable=True),
+    sa.Column('last_challenge_date', sa.TIMESTAMP(), nullable=True),
+    sa.Column('streak_updated_today', sa.Boolean(), nullable=True),
+    sa.Column('certificate', sa.Boolean(), nullable=True),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['accounts.user_id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_table('signs',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('lesson_id', sa.Integer(), nullable=False),
+    sa.Column('text', sa.String(length=255), nullable=False),
+    sa.Column('video_url', sa.String(length=512), nullable=False),
+    sa.Column('difficulty_level', sa.Enum('beginner', 'intermediate', 'advanced'), nullable=True),
+    sa.Column('archived', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['lesson_id'], ['lessons.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('user_practice_progress',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('level_id', sa.Integer(), nullable=True),
+    sa.Column('game_id', sa.Integer(), nullable=True),
+    sa.Column('high_score', sa.Integer(), nullable=True),
+    sa.Column('progress', sa.Integer(), nullable=True),
+    sa.Column('completed', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['game_id'], ['practice_games.id'], ),
+    sa.ForeignKeyConstraint(['level_id'], ['practice_levels.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['accounts.user_id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('user_progress',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('lesson_id', sa.Integer(), nullable=True),
+    sa.Column('progress', sa.Integer(), nullable=True),
+    sa.Column('completed', sa.Boolean(), nullable=True),
+    sa.Column('last_question', sa.Integer(), nullable=True),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['lesson_id'], ['lessons.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['accounts.user_id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('sign_attempts',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('sign_id', sa.Integer(), nullable=False),
+    sa.Column('attempt_time', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+    sa.Column('is_correct', sa.Boolean(), nullable=False),
+    sa.ForeignKeyConstraint(['sign_id'], ['signs.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['accounts.user_id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('sign_attempts')
+    op.drop_table('user_progress')
+    op.drop_table('user_practice_progress')
+    op.drop_table('signs')
+    op.drop_table('users')
+    op.drop_table('practice_games')
+    op.drop_table('lessons')
+    op.drop_table('units')
+    op.drop_table('practice_levels')
+    op.drop_index(op.f('ix_heart_packages_id'), table_name='heart_packages')
+    op.drop_table('heart_packages')
+    op.drop_table('accounts')
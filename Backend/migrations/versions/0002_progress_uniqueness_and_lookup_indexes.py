@@ -0,0 +1,81 @@
+"""progress uniqueness and lookup indexes
+
+Composite indexes for the lookups every request makes, and unique
+indexes so a user has one progress row per lesson and per practice game.
+
+Duplicate progress rows are merged before the unique indexes are built:
+the oldest row of each group keeps the best progress, completion and
+score of the group, and the others are deleted.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:04:39.460793
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def merge_duplicates(table_name, key_columns, merged_columns):
+    bind = op.get_bind()
+    table = sa.table(
+        table_name,
+        sa.column('id'),
+        *(sa.column(name) for name in key_columns + merged_columns),
+    )
+    keys = [table.c[name] for name in key_columns]
+    groups = bind.execute(
+        sa.select(*keys).group_by(*keys).having(sa.func.count() > 1)
+    ).all()
+    for group in groups:
+        rows = bind.execute(
+            sa.select(table.c.id, *(table.c[name] for name in merged_columns))
+            .where(*(column == value for column, value in zip(keys, group)))
+            .order_by(table.c.id)
+        ).all()
+        keep, *extra = rows
+        merged = {
+            name: max((row._mapping[name] for row in rows if row._mapping[name] is not None), default=None)
+            for name in merged_columns
+        }
+        bind.execute(table.update().where(table.c.id == keep.id).values(**merged))
+        bind.execute(table.delete().where(table.c.id.in_([row.id for row in extra])))
+    if groups:
+        print(f"Merged {len(groups)} duplicate groups in {table_name}")
+
+
+def upgrade() -> None:
+    merge_duplicates('user_progress', ['user_id', 'lesson_id'], ['progress', 'completed', 'last_question'])
+    merge_duplicates(
+        'user_practice_progress',
+        ['user_id', 'level_id', 'game_id'],
+        ['high_score', 'progress', 'completed'],
+    )
+
+    op.create_index('ix_lessons_unit_archived_order', 'lessons', ['unit_id', 'archived', 'order_index'], unique=False)
+    op.create_index('ix_signs_difficulty_archived', 'signs', ['difficulty_level', 'archived'], unique=False)
+    op.create_index('ix_signs_lesson_archived', 'signs', ['lesson_id', 'archived'], unique=False)
+    op.create_index('uq_user_practice_progress_user_level_game', 'user_practice_progress', ['user_id', 'level_id', 'game_id'], unique=True)
+    op.create_index('uq_user_progress_user_lesson', 'user_progress', ['user_id', 'lesson_id'], unique=True)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'mysql':
+        # MySQL drops a foreign key's implicit index once another index covers
+        # it, and refuses to drop that covering index; give the keys their own
+        op.create_index('ix_user_progress_user_id', 'user_progress', ['user_id'])
+        op.create_index('ix_user_practice_progress_user_id', 'user_practice_progress', ['user_id'])
+        op.create_index('ix_signs_lesson_id', 'signs', ['lesson_id'])
+        op.create_index('ix_lessons_unit_id', 'lessons', ['unit_id'])
+    op.drop_index('uq_user_progress_user_lesson', table_name='user_progress')
+    op.drop_index('uq_user_practice_progress_user_level_game', table_name='user_practice_progress')
+    op.drop_index('ix_signs_lesson_archived', table_name='signs')
+    op.drop_index('ix_signs_difficulty_archived', table_name='signs')
+    op.drop_index('ix_lessons_unit_archived_order', table_name='lessons')
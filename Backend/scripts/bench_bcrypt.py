@@ -0,0 +1,101 @@
+"""Measure the bcrypt cost factor and the password hashing pool.
+
+For each cost factor, times single hashes; then, at BCRYPT_ROUNDS, runs a
+burst of verifications through app.auth.password_hasher and reports
+throughput and how long the event loop went without running (the stall
+other requests would see), against verifying inline as the handlers used to.
+
+Pick the highest cost whose single-hash time stays under your login latency
+budget, then set BCRYPT_ROUNDS and PASSWORD_HASH_WORKERS to match.
+
+Run from the Backend directory:
+
+    python -m scripts.bench_bcrypt --rounds 10 11 12 13 --logins 32
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from passlib.context import CryptContext
+
+from app.auth import password_hasher, pwd_context
+from app.config import BCRYPT_ROUNDS
+
+PASSWORD = "correct horse battery staple"
+
+
+def time_rounds(rounds: int, repeat: int) -> float:
+    context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        context.hash(PASSWORD)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def worst_stall(run) -> tuple:
+    """Run ``run`` alongside a 1 ms ticker; returns (seconds, max loop stall ms)."""
+    stall = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal stall
+        last = time.perf_counter()
+        while not done:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            stall = max(stall, (now - last) * 1000 - 1)
+            last = now
+
+    tick = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await run()
+    elapsed = time.perf_counter() - start
+    done = True
+    await tick
+    return elapsed, stall
+
+
+async def burst(logins: int, hashed: str):
+    async def inline():
+        for _ in range(logins):
+            pwd_context.verify(PASSWORD, hashed)
+            await asyncio.sleep(0)
+
+    async def pooled():
+        await asyncio.gather(*(password_hasher.verify(PASSWORD, hashed) for _ in range(logins)))
+
+    for name, run in (("inline", inline), ("pool", pooled)):
+        elapsed, stall = await worst_stall(run)
+        print(
+            f"{name:>6}: {logins / elapsed:7.1f} logins/s, "
+            f"worst event-loop stall {stall:8.1f} ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 11, 12, 13])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--logins", type=int, default=32)
+    args = parser.parse_args()
+
+    print("cost  ms/hash")
+    for rounds in args.rounds:
+        print(f"{rounds:4d}  {time_rounds(rounds, args.repeat):7.1f}")
+
+    print(f"\n{args.logins} verifications at BCRYPT_ROUNDS={BCRYPT_ROUNDS}, "
+          f"PASSWORD_HASH_WORKERS={password_hasher.workers}")
+    hashed = pwd_context.hash(PASSWORD)
+    password_hasher.max_pending = 0  # measure queueing, not rejections
+    asyncio.run(burst(args.logins, hashed))
+    stats = password_hasher.stats()
+    print(f"pool queue wait mean {stats['wait_ms']['mean']} ms, run mean {stats['verify_ms']['mean']} ms")
+    password_hasher.executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Micro-benchmark for recognition preprocessing.
+
+Compares the original per-request chain (decode -> cvtColor -> resize ->
+/ 255.0 -> expand_dims, then np.stack for a batch) with
+app.services.preprocessing (decode -> resize -> cvtColor, then one
+float32 pass into a reused batch buffer).
+
+Run from the Backend directory:
+
+    python -m scripts.bench_preprocessing --frames 256 --batch 16
+"""
+import argparse
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from app.services.preprocessing import BatchBuffer, decode_frame
+
+SIZE = (224, 224)
+
+
+def synthetic_jpeg(width: int, height: int, seed: int) -> bytes:
+    rng = np.random.default_rng(seed)
+    img = rng.integers(0, 256, (height // 8, width // 8, 3), dtype=np.uint8)
+    img = cv2.resize(img, (width, height), interpolation=cv2.INTER_LINEAR)
+    ok, buf = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, 85])
+    return buf.tobytes()
+
+
+def legacy_batch(payloads):
+    images = []
+    for data in payloads:
+        img = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+        img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        img = cv2.resize(img, SIZE)
+        img = img / 255.0
+        images.append(np.expand_dims(img, axis=0))
+    # TensorFlow casts the float64 batch to float32 on the way in
+    return np.concatenate(images).astype(np.float32)
+
+
+def pipeline_batch(payloads, buffer: BatchBuffer):
+    return buffer.normalize([decode_frame(data, SIZE) for data in payloads])
+
+
+def measure(fn, batches):
+    fn(batches[0])  # warm caches and the batch buffer
+    tracemalloc.start()
+    start = time.perf_counter()
+    for batch in batches:
+        fn(batch)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=256)
+    parser.add_argument("--batch", type=int, default=16)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    args = parser.parse_args()
+
+    payloads = [synthetic_jpeg(args.width, args.height, i) for i in range(args.frames)]
+    batches = [payloads[i:i + args.batch] for i in range(0, len(payloads), args.batch)]
+    buffer = BatchBuffer(args.batch)
+
+    legacy = legacy_batch(batches[0])
+    current = pipeline_batch(batches[0], buffer)
+    max_diff = float(np.abs(legacy - current).max())
+
+    legacy_time, legacy_peak = measure(legacy_batch, batches)
+    current_time, current_peak = measure(lambda b: pipeline_batch(b, buffer), batches)
+
+    print(f"{args.frames} frames of {args.width}x{args.height}, batch {args.batch}")
+    print(f"max abs difference vs legacy: {max_diff:.2e}")
+    print(f"{'':10}{'us/frame':>12}{'peak alloc MB':>16}")
+    for name, elapsed, peak in (
+        ("legacy", legacy_time, legacy_peak),
+        ("pipeline", current_time, current_peak),
+    ):
+        print(f"{name:10}{elapsed / args.frames * 1e6:12.1f}{peak / 1e6:16.2f}")
+
+
+if __name__ == "__main__":
+    main()
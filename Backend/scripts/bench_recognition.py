@@ -0,0 +1,245 @@
+"""Latency and throughput benchmark for sign recognition.
+
+Sweeps synthetic JPEG resolutions and client concurrency, and reports
+p50/p95/p99 latency, frames per second, CPU and RSS for each point.
+
+in-process mode loads the model with the normal RECOGNITION_* / INFERENCE_*
+settings and drives recognition_service.recognize, the path behind
+/predict, without HTTP in the way:
+
+    python -m scripts.bench_recognition --mode inprocess
+
+http mode drives a running server with one thread per concurrent client.
+Pass --server-pid to sample the server's CPU and RSS instead of the
+client's. Start the server with the prediction cache off, since the
+synthetic frames repeat. The benchmark's requests are anonymous, so only
+RECOGNITION_MAX_IN_FLIGHT (64 by default) applies to them; raise it if
+--concurrency goes higher, or the excess shows up as 503s:
+
+    RECOGNITION_CACHE_SIZE=0 uvicorn app.main:app &
+    python -m scripts.bench_recognition --mode http --url http://127.0.0.1:8000 --server-pid $!
+
+Results go to --output as JSON, tagged with the git commit, so runs can be
+diffed between commits. Nothing here needs network access beyond --url.
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from scripts.bench_preprocessing import synthetic_jpeg
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+
+
+def cpu_seconds(pid: int) -> float:
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    # utime and stime are fields 14 and 15 of /proc/<pid>/stat
+    return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+
+
+def rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def summarize(latencies_ms, errors, elapsed, cpu_before, cpu_after, rss):
+    latencies = np.array(latencies_ms) if latencies_ms else np.zeros(1)
+    return {
+        "requests": len(latencies_ms) + sum(errors.values()),
+        "ok": len(latencies_ms),
+        "errors": errors,
+        "p50_ms": round(float(np.percentile(latencies, 50)), 2),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 2),
+        "p99_ms": round(float(np.percentile(latencies, 99)), 2),
+        "mean_ms": round(float(latencies.mean()), 2),
+        "fps": round(len(latencies_ms) / elapsed, 1),
+        "cpu_percent": round((cpu_after - cpu_before) / elapsed * 100, 1),
+        "rss_mb": round(rss, 1),
+    }
+
+
+async def run_inprocess(payloads, concurrency, requests, pid):
+    from app.services import recognition_service
+
+    latencies, errors = [], {}
+    next_index = 0
+
+    async def client():
+        nonlocal next_index
+        while next_index < requests:
+            data = payloads[next_index % len(payloads)]
+            next_index += 1
+            start = time.perf_counter()
+            try:
+                await recognition_service.recognize(data)
+            except Exception as e:
+                errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    cpu_before, start = cpu_seconds(pid), time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return summarize(latencies, errors, elapsed, cpu_before, cpu_seconds(pid), rss_mb(pid))
+
+
+def http_request(url: str, endpoint: str, data: bytes):
+    if endpoint == "predict":
+        body = json.dumps({"image": base64.b64encode(data).decode()}).encode()
+        content_type = "application/json"
+    else:
+        body, content_type = data, "image/jpeg"
+    request = urllib.request.Request(
+        f"{url}/api/recognition/{endpoint}", data=body,
+        headers={"Content-Type": content_type}, method="POST",
+    )
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            response.read()
+    except urllib.error.HTTPError as e:
+        return None, str(e.code)
+    except OSError as e:
+        return None, type(e).__name__
+    return (time.perf_counter() - start) * 1000, None
+
+
+def run_http(payloads, concurrency, requests, pid, url, endpoint):
+    latencies, errors = [], {}
+    cpu_before, start = cpu_seconds(pid), time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [
+            pool.submit(http_request, url, endpoint, payloads[i % len(payloads)])
+            for i in range(requests)
+        ]
+        for future in futures:
+            latency, error = future.result()
+            if error:
+                errors[error] = errors.get(error, 0) + 1
+            else:
+                latencies.append(latency)
+    elapsed = time.perf_counter() - start
+    return summarize(latencies, errors, elapsed, cpu_before, cpu_seconds(pid), rss_mb(pid))
+
+
+async def load_model():
+    from app.services import recognition_service
+
+    if not await recognition_service.load_recognition_model():
+        raise SystemExit(f"Model failed to load: {recognition_service.registry.info()}")
+    # Synthetic payloads repeat across requests; measure the model, not the
+    # cache, and don't let admission control turn the load away.
+    recognition_service.prediction_cache.max_entries = 0
+    recognition_service.admission.max_in_flight = 0
+    recognition_service.admission.max_per_user = 0
+    return recognition_service
+
+
+def parse_resolutions(value: str):
+    return [tuple(int(n) for n in part.split("x")) for part in value.split(",")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=["inprocess", "http"], default="inprocess")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--endpoint", choices=["predict-binary", "predict"], default="predict-binary")
+    parser.add_argument("--server-pid", type=int, help="sample CPU/RSS of this process in http mode")
+    parser.add_argument("--resolutions", default="320x240,640x480,1280x720")
+    parser.add_argument("--concurrency", default="1,4,16")
+    parser.add_argument("--requests", type=int, default=200, help="requests per sweep point")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--unique-frames", type=int, default=32)
+    parser.add_argument("--output", default="bench_recognition.json")
+    args = parser.parse_args()
+
+    resolutions = parse_resolutions(args.resolutions)
+    concurrencies = [int(n) for n in args.concurrency.split(",")]
+    pid = args.server_pid if args.mode == "http" and args.server_pid else os.getpid()
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    config = {}
+    if args.mode == "inprocess":
+        recognition_service = loop.run_until_complete(load_model())
+        model_version = recognition_service.registry.active
+        info = model_version.info()
+        config = {
+            key: info[key]
+            for key in ("backend", "pool_workers", "version", "input_size", "load_time_ms", "warm_latency_ms")
+        }
+        batcher = model_version.batcher.stats()
+        config.update({key: batcher[key] for key in ("max_batch_size", "max_wait_ms", "max_concurrent_batches")})
+
+    results = []
+    print(f"{'resolution':>11}{'conc':>6}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'fps':>8}{'CPU %':>8}{'RSS MB':>8}{'errors':>8}")
+    for width, height in resolutions:
+        payloads = [synthetic_jpeg(width, height, seed) for seed in range(args.unique_frames)]
+        for concurrency in concurrencies:
+            if args.mode == "inprocess":
+                loop.run_until_complete(run_inprocess(payloads, concurrency, args.warmup, pid))
+                point = loop.run_until_complete(run_inprocess(payloads, concurrency, args.requests, pid))
+            else:
+                run_http(payloads, concurrency, args.warmup, pid, args.url, args.endpoint)
+                point = run_http(payloads, concurrency, args.requests, pid, args.url, args.endpoint)
+            point.update(
+                width=width, height=height, concurrency=concurrency,
+                jpeg_kb=round(float(np.mean([len(p) for p in payloads])) / 1024, 1),
+            )
+            results.append(point)
+            print(
+                f"{f'{width}x{height}':>11}{concurrency:6}{point['p50_ms']:9.2f}{point['p95_ms']:9.2f}"
+                f"{point['p99_ms']:9.2f}{point['fps']:8.1f}{point['cpu_percent']:8.1f}"
+                f"{point['rss_mb']:8.1f}{sum(point['errors'].values()):8}"
+            )
+
+    if args.mode == "inprocess":
+        worker = model_version.batcher.worker
+        if worker is not None:
+            worker.cancel()
+            loop.run_until_complete(asyncio.gather(worker, return_exceptions=True))
+        recognition_service.shutdown_model()
+    loop.close()
+
+    report = {
+        "git_commit": git_commit(),
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "mode": args.mode,
+        "endpoint": args.endpoint if args.mode == "http" else "recognize",
+        "cpu_count": os.cpu_count(),
+        "python": sys.version.split()[0],
+        "config": config,
+        "results": results,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""Accuracy-vs-latency report for the recognition model backends.
+
+Expects a held-out folder with one sub-folder per letter:
+
+    heldout/a/0001.jpg
+    heldout/b/0001.jpg
+    ...
+
+Run from the Backend directory, one name=path pair per backend:
+
+    python -m scripts.compare_backends --images heldout \\
+        keras=models/model.h5 tflite=models/model.float16.tflite onnx=models/model.onnx
+
+Sub-folder names are matched, case-insensitively, against the labels in
+each model's manifest (``<model>.labels.json``, A-Z without one); folders
+for other labels are skipped.
+
+The first backend is the reference for the agreement column. Each backend
+is measured in a fresh subprocess so load time and RSS are not polluted by
+the others; one that crashes or runs past ``--timeout`` is reported and
+left out.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from pathlib import Path
+from queue import Empty
+
+import numpy as np
+
+from app.services.model_backends import create_backend
+from app.services.preprocessing import BatchBuffer, decode_frame
+from app.services.model_registry import read_manifest
+from scripts.export_model import iter_images
+
+
+def rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def load_heldout(folder: Path, limit: int, labels, input_size):
+    label_index = {label.lower(): index for index, label in enumerate(labels)}
+    frames, targets = [], []
+    for path in iter_images(folder):
+        index = label_index.get(path.parent.name.lower())
+        if index is None:
+            continue
+        frames.append(decode_frame(path.read_bytes(), input_size))
+        targets.append(index)
+        if limit and len(frames) >= limit:
+            break
+    return frames, np.array(targets)
+
+
+def measure_backend(name, path, folder, limit, batch_size, threads, queue):
+    model_labels, input_size = read_manifest(path)
+    frames, labels = load_heldout(Path(folder), limit, model_labels, input_size)
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    backend = create_backend(name, path, threads)
+    backend.load()
+    load_ms = (time.perf_counter() - start) * 1000
+    buffer = BatchBuffer(batch_size)
+    backend.predict(buffer.normalize(frames[:1]))
+
+    single_ms, predictions = [], []
+    for frame in frames:
+        start = time.perf_counter()
+        predictions.append(backend.predict(buffer.normalize([frame]))[0])
+        single_ms.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    for i in range(0, len(frames), batch_size):
+        backend.predict(buffer.normalize(frames[i:i + batch_size]))
+    batched_fps = len(frames) / (time.perf_counter() - start)
+
+    predicted = np.argmax(np.stack(predictions), axis=1)
+    queue.put({
+        "backend": name,
+        "path": path,
+        "model_bytes": os.path.getsize(path),
+        "frames": len(frames),
+        "accuracy": float(np.mean(predicted == labels)) if len(labels) else None,
+        # Labels, not output indices, so backends with different manifests compare
+        "predicted": [model_labels[index] for index in predicted],
+        "load_ms": round(load_ms, 1),
+        "rss_delta_mb": round(rss_mb() - rss_before, 1),
+        "p50_ms": round(float(np.percentile(single_ms, 50)), 2),
+        "p95_ms": round(float(np.percentile(single_ms, 95)), 2),
+        f"batch{batch_size}_fps": round(batched_fps, 1),
+    })
+
+
+def wait_for_result(process, queue, timeout: float):
+    """The child's report; raises RuntimeError if it dies or takes too long."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return queue.get(timeout=1)
+        except Empty:
+            pass
+        if process.exitcode is not None:
+            raise RuntimeError(f"measurement process exited with code {process.exitcode}")
+        if time.monotonic() > deadline:
+            process.kill()
+            raise RuntimeError(f"no result within {timeout:g}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("backends", nargs="+", help="name=path, e.g. tflite=models/model.tflite")
+    parser.add_argument("--images", required=True, help="held-out folder of <letter>/ sub-folders")
+    parser.add_argument("--limit", type=int, default=0, help="max frames (0 = all)")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--threads", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=600, help="seconds allowed per backend")
+    parser.add_argument("--output", default="backend_report.json")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    results = []
+    failed = False
+    for spec in args.backends:
+        name, _, path = spec.partition("=")
+        queue = context.Queue()
+        process = context.Process(
+            target=measure_backend,
+            args=(name, path, args.images, args.limit, args.batch_size, args.threads, queue),
+        )
+        process.start()
+        try:
+            results.append(wait_for_result(process, queue, args.timeout))
+        except RuntimeError as e:
+            print(f"❌ {name}: {e}")
+            failed = True
+        process.join()
+
+    if not results:
+        sys.exit(1)
+    reference = np.array(results[0]["predicted"])
+    for result in results:
+        predicted = np.array(result.pop("predicted"))
+        result["agreement"] = float(np.mean(predicted == reference)) if len(predicted) == len(reference) else None
+
+    fps_key = f"batch{args.batch_size}_fps"
+    print(f"{'backend':10}{'MB':>8}{'acc':>8}{'agree':>8}{'p50 ms':>9}{'p95 ms':>9}{'fps':>9}{'RSS MB':>9}")
+    for r in results:
+        accuracy = f"{r['accuracy']:.3f}" if r["accuracy"] is not None else "-"
+        agreement = f"{r['agreement']:.3f}" if r["agreement"] is not None else "-"
+        print(
+            f"{r['backend']:10}{r['model_bytes'] / 1e6:8.1f}{accuracy:>8}{agreement:>8}"
+            f"{r['p50_ms']:9.2f}{r['p95_ms']:9.2f}{r[fps_key]:9.1f}{r['rss_delta_mb']:9.1f}"
+        )
+
+    Path(args.output).write_text(json.dumps(results, indent=2))
+    print(f"Report written to {args.output}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
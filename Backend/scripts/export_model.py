@@ -0,0 +1,105 @@
+"""Convert the Keras recognition model for the TFLite or ONNX Runtime backends.
+
+Run from the Backend directory:
+
+    python -m scripts.export_model --format tflite --quantize float16
+    python -m scripts.export_model --format tflite --quantize int8 --representative-dir data/calibration
+    python -m scripts.export_model --format onnx
+
+int8 needs a folder of sample frames (any nesting, .jpg/.png) to calibrate
+activation ranges; a few hundred representative webcam frames is plenty.
+Point RECOGNITION_BACKEND / RECOGNITION_MODEL_PATH at the output to serve it.
+"""
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+from app.services.preprocessing import decode_frame
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png"}
+
+
+def iter_images(folder: Path):
+    for path in sorted(folder.rglob("*")):
+        if path.suffix.lower() in IMAGE_SUFFIXES:
+            yield path
+
+
+def representative_dataset(folder: Path, size, limit: int):
+    def generator():
+        for i, path in enumerate(iter_images(folder)):
+            if i >= limit:
+                break
+            frame = decode_frame(path.read_bytes(), size)
+            yield [frame[np.newaxis].astype(np.float32) / 255.0]
+    return generator
+
+
+def export_tflite(model, args, size):
+    import tensorflow as tf
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    if args.quantize == "float16":
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.target_spec.supported_types = [tf.float16]
+    elif args.quantize == "int8":
+        if not args.representative_dir:
+            raise SystemExit("--quantize int8 needs --representative-dir")
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = representative_dataset(
+            Path(args.representative_dir), size, args.calibration_frames
+        )
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        # Weights and activations are int8; the I/O tensors stay float32 so
+        # the service can feed the same normalized batches to every backend.
+    Path(args.output).write_bytes(converter.convert())
+
+
+def export_onnx(model, args, size):
+    import tensorflow as tf
+    import tf2onnx
+
+    spec = [tf.TensorSpec((None, size[1], size[0], 3), tf.float32, name="input")]
+    tf2onnx.convert.from_keras(model, input_signature=spec, opset=args.opset, output_path=args.output)
+
+    if args.quantize == "int8":
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        float_path = Path(args.output)
+        quantized = float_path.with_name(float_path.stem + ".int8.onnx")
+        quantize_dynamic(str(float_path), str(quantized), weight_type=QuantType.QInt8)
+        print(f"int8 weights written to {quantized}")
+    elif args.quantize == "float16":
+        raise SystemExit("float16 is only supported for --format tflite")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", default="models/model.h5")
+    parser.add_argument("--format", choices=["tflite", "onnx"], required=True)
+    parser.add_argument("--quantize", choices=["none", "float16", "int8"], default="none")
+    parser.add_argument("--representative-dir")
+    parser.add_argument("--calibration-frames", type=int, default=300)
+    parser.add_argument("--opset", type=int, default=13)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    import tensorflow as tf
+
+    model = tf.keras.models.load_model(args.source)
+    size = (int(model.input_shape[2]), int(model.input_shape[1]))
+    if not args.output:
+        # ONNX int8 is derived from the float export, see export_onnx
+        suffix = "" if args.quantize == "none" or args.format == "onnx" else f".{args.quantize}"
+        args.output = str(Path(args.source).with_suffix(f"{suffix}.{args.format}"))
+
+    if args.format == "tflite":
+        export_tflite(model, args, size)
+    else:
+        export_onnx(model, args, size)
+    print(f"✅ Exported {args.source} -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+import os
+import tempfile
+
+import pytest
+
+# app.config reads the environment on import, so point it at a scratch
+# SQLite database before any test module imports the app
+_database_dir = tempfile.mkdtemp(prefix="senya-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_database_dir}/test.db"
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ["SCHEMA_CHECK"] = "off"
+
+from alembic import command
+from alembic.config import Config
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="session")
+def database_url() -> str:
+    """The scratch database, migrated to head with the real Alembic scripts."""
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    command.upgrade(config, "head")
+    return os.environ["DATABASE_URL"]
@@ -0,0 +1,43 @@
+"""InstrumentedPool counts overflow, timeouts and peaks exactly under concurrency."""
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.services.db_pool import InstrumentedPool
+
+
+async def concurrent_checkouts(database_url: str, checkouts: int):
+    engine = create_async_engine(
+        database_url,
+        poolclass=InstrumentedPool,
+        pool_size=2,
+        max_overflow=1,
+        pool_timeout=0.5,
+    )
+    release = asyncio.Event()
+
+    async def hold():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await release.wait()
+
+    try:
+        tasks = [asyncio.create_task(hold()) for _ in range(checkouts)]
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        return engine.pool.stats(), results
+    finally:
+        await engine.dispose()
+
+
+def test_concurrent_checkouts_count_overflow_once(database_url):
+    stats, results = asyncio.run(concurrent_checkouts(database_url, 4))
+
+    assert sum(isinstance(result, PoolTimeoutError) for result in results) == 1
+    assert stats["peak_checked_out"] == 3
+    assert stats["timeouts"] == 1
+    assert stats["overflow_events"] == 1
+    assert stats["checkouts"] == 3
@@ -0,0 +1,75 @@
+"""The hot lookups are served by the indexes added for them.
+
+Runs EXPLAIN QUERY PLAN for the queries the request handlers make on every
+lesson, practice and progress request, against a database migrated to head.
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.future import select
+
+from app.models import Lesson, Sign, UserPracticeProgress, UserProgress
+
+CHECKS = [
+    (
+        "progress by user and lesson",
+        select(UserProgress).where(UserProgress.user_id == 1, UserProgress.lesson_id == 1),
+        "uq_user_progress_user_lesson",
+    ),
+    (
+        "completed lessons of a user",
+        select(UserProgress.lesson_id).where(UserProgress.user_id == 1, UserProgress.completed == True),
+        "uq_user_progress_user_lesson",
+    ),
+    (
+        "practice progress by user, level and game",
+        select(UserPracticeProgress).where(
+            UserPracticeProgress.user_id == 1,
+            UserPracticeProgress.level_id == 1,
+            UserPracticeProgress.game_id == 1,
+        ),
+        "uq_user_practice_progress_user_level_game",
+    ),
+    (
+        "active signs of a lesson",
+        select(Sign).where(Sign.lesson_id == 1, Sign.archived == False),
+        "ix_signs_lesson_archived",
+    ),
+    (
+        "active signs by difficulty",
+        select(Sign).where(Sign.difficulty_level == "beginner", Sign.archived == False),
+        "ix_signs_difficulty_archived",
+    ),
+    (
+        "active lessons of a unit in order",
+        select(Lesson).where(Lesson.unit_id == 1, Lesson.archived == False).order_by(Lesson.order_index),
+        "ix_lessons_unit_archived_order",
+    ),
+]
+
+
+def used_indexes(plan) -> set:
+    # "SEARCH user_progress USING INDEX uq_user_progress_user_lesson (...)"
+    used = set()
+    for row in plan:
+        words = row._mapping["detail"].split()
+        if "INDEX" in words:
+            used.add(words[words.index("INDEX") + 1])
+    return used
+
+
+async def explain(database_url: str, statement) -> set:
+    engine = create_async_engine(database_url, future=True)
+    try:
+        async with engine.connect() as conn:
+            sql = str(statement.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+            return used_indexes((await conn.execute(text("EXPLAIN QUERY PLAN " + sql))).all())
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.parametrize("statement, index", [check[1:] for check in CHECKS], ids=[check[0] for check in CHECKS])
+def test_lookup_uses_its_index(database_url, statement, index):
+    assert index in asyncio.run(explain(database_url, statement))
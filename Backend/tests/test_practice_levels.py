@@ -0,0 +1,108 @@
+"""The practice levels screen takes the same number of queries however big the curriculum is."""
+import asyncio
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import (
+    Account, Lesson, PracticeGame, PracticeLevel, Unit, UserPracticeProgress, UserProfile, UserProgress,
+)
+from app.services.practice_service import get_practice_levels
+
+LEVEL_NAMES = ["Beginner", "Intermediate", "Advanced"]
+
+
+async def create_user(session: AsyncSession) -> int:
+    account = Account(name="Practice", email="practice-levels@example.com", hash_password="x")
+    session.add(account)
+    await session.flush()
+    session.add(UserProfile(user_id=account.user_id))
+    await session.commit()
+    return account.user_id
+
+
+async def add_units(session: AsyncSession, user_id: int, start: int, count: int):
+    """Units of three lessons each; the user has completed unit 0 only."""
+    for unit_index in range(start, start + count):
+        unit = Unit(title=f"Practice unit {unit_index}", order_index=unit_index)
+        session.add(unit)
+        await session.flush()
+        for lesson_index in range(3):
+            lesson = Lesson(unit_id=unit.id, title=f"Lesson {unit_index}.{lesson_index}", order_index=lesson_index)
+            session.add(lesson)
+            await session.flush()
+            if unit_index == 0:
+                session.add(UserProgress(user_id=user_id, lesson_id=lesson.id, progress=100, completed=True))
+    await session.commit()
+
+
+async def add_games(session: AsyncSession, user_id: int, start: int, count: int):
+    """Games on each of the three levels; the user has played every Beginner game."""
+    levels = (await session.execute(select(PracticeLevel).order_by(PracticeLevel.order_index))).scalars().all()
+    if not levels:
+        levels = [
+            PracticeLevel(name=name, required_progress=level_index * 40, order_index=level_index)
+            for level_index, name in enumerate(LEVEL_NAMES)
+        ]
+        session.add_all(levels)
+        await session.flush()
+
+    for level in levels:
+        for game_index in range(start, start + count):
+            game = PracticeGame(level_id=level.id, game_identifier=f"{level.name.lower()}-{game_index}", name=f"Game {game_index}")
+            session.add(game)
+            await session.flush()
+            if level.order_index == 0:
+                session.add(UserPracticeProgress(
+                    user_id=user_id, level_id=level.id, game_id=game.id,
+                    high_score=70 + game_index, progress=70 + game_index, completed=False,
+                ))
+    await session.commit()
+
+
+async def levels_for_small_and_large_curricula(database_url: str):
+    """Practice levels and the statements behind them at 2 units, then again at 12."""
+    engine = create_async_engine(database_url, future=True)
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def measure(user_id: int):
+        async with session_factory() as session:
+            statements.clear()
+            levels = await get_practice_levels(session, user_id)
+            return levels, list(statements)
+
+    try:
+        async with session_factory() as session:
+            user_id = await create_user(session)
+            await add_units(session, user_id, 0, 2)
+            await add_games(session, user_id, 0, 2)
+        small = await measure(user_id)
+
+        async with session_factory() as session:
+            await add_units(session, user_id, 2, 10)
+            await add_games(session, user_id, 2, 10)
+        large = await measure(user_id)
+        return small, large
+    finally:
+        await engine.dispose()
+
+
+def test_practice_levels_query_count_does_not_grow_with_curriculum(database_url):
+    (small, small_statements), (large, large_statements) = asyncio.run(
+        levels_for_small_and_large_curricula(database_url)
+    )
+
+    assert len(small_statements) == 3, "\n\n".join(small_statements)
+    assert len(large_statements) == len(small_statements), "\n\n".join(large_statements)
+
+    assert [len(level["games"]) for level in small["levels"]] == [2, 2, 2]
+    assert small["overall_progress"] == 50
+    assert [level["unlocked"] for level in small["levels"]] == [True, True, False]
+
+    assert [len(level["games"]) for level in large["levels"]] == [12, 12, 12]
+    assert large["overall_progress"] == 8
+    assert [level["unlocked"] for level in large["levels"]] == [True, False, False]
+    assert sorted(game["userProgress"]["high_score"] for game in large["levels"][0]["games"]) == list(range(70, 82))
@@ -0,0 +1,85 @@
+"""The sign-check WebSocket stream ends cleanly when the client goes away."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import WebSocketDisconnect
+
+import app.main  # noqa: F401  (the routes import the app's session factory)
+from app.routes import recognition_routes
+from app.routes.recognition_routes import LatestFrame, check_sign_stream
+from app.services import recognition_service
+
+
+def test_take_returns_none_once_closed_and_drained():
+    async def scenario():
+        mailbox = LatestFrame()
+        mailbox.put(b"frame")
+        mailbox.close()
+        first = await asyncio.wait_for(mailbox.take(), 1)
+        second = await asyncio.wait_for(mailbox.take(), 1)
+        return first, second
+
+    assert asyncio.run(scenario()) == (b"frame", None)
+
+
+class DepartingClient:
+    """Sends one frame and disconnects; sending to it fails as it would under uvicorn."""
+
+    def __init__(self, send_error: Exception):
+        self.messages = [
+            {"type": "websocket.receive", "bytes": b"frame"},
+            {"type": "websocket.disconnect", "code": 1001},
+        ]
+        self.send_error = send_error
+        self.accepted = False
+
+    async def accept(self):
+        self.accepted = True
+
+    async def close(self, code=None, reason=None):
+        pass
+
+    async def receive(self):
+        if self.messages:
+            return self.messages.pop(0)
+        await asyncio.Event().wait()
+
+    async def send_json(self, message):
+        raise self.send_error
+
+
+class FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def get(self, model, sign_id):
+        return SimpleNamespace(id=sign_id, text="A")
+
+
+@pytest.mark.parametrize("send_error", [
+    RuntimeError('Cannot call "send" once a close message has been sent.'),
+    OSError("client disconnected"),
+    WebSocketDisconnect(1001),
+], ids=["runtime-error", "os-error", "websocket-disconnect"])
+def test_disconnect_while_frame_pending(monkeypatch, send_error):
+    async def get_user_from_token(token, db):
+        return SimpleNamespace(user_id=1)
+
+    async def recognize(data):
+        # The client leaves while this frame is being recognized
+        await asyncio.sleep(0.05)
+        return {"letter": "A", "confidence": 0.9}
+
+    monkeypatch.setattr(recognition_routes, "async_session", FakeSession)
+    monkeypatch.setattr(recognition_routes, "get_user_from_token", get_user_from_token)
+    monkeypatch.setattr(recognition_routes, "recognize", recognize)
+    client = DepartingClient(send_error)
+
+    asyncio.run(asyncio.wait_for(check_sign_stream(client, sign_id=1, token="token"), 2))
+
+    assert client.accepted
+    assert recognition_service.admission.in_flight == 0